@@ -1,19 +1,75 @@
 from __future__ import annotations
 
-import time
+import asyncio
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, TypeVar
+from typing import Any, Awaitable, Callable, Coroutine, TypeVar
+
+from agents.clients import ClientRegistry
+from agents.rate_limiter import RateLimiter, get_rate_limiter
+from agents.retry import RETRY_POLICIES, classify_error, get_circuit_breaker, retry_after
+from agents.token_estimator import estimate_tokens
 
 T = TypeVar("T")
 
 
+class _AgentLoop:
+    """Background event loop shared by every agent in the process.
+
+    The sync agent methods submit their coroutines here, so blocking callers
+    (the CLI, worker threads in write-all) all share one loop and one set of
+    in-flight requests instead of spinning up a loop per call.
+    """
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._loop.run_forever, name="bookforge-agents", daemon=True)
+                thread.start()
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError("Sync agent methods cannot be called from async code; await the *_async method.")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+_AGENT_LOOP = _AgentLoop()
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run an agent coroutine to completion from synchronous code."""
+    return _AGENT_LOOP.run(coro)
+
+
 class BaseAgent:
-    def __init__(self, config, exporter, cost_tracker, log_path: Path):
+    def __init__(
+        self,
+        config,
+        exporter,
+        cost_tracker,
+        log_path: Path,
+        clients: ClientRegistry | None = None,
+        cache=None,
+    ):
         self.config = config
         self.exporter = exporter
         self.cost_tracker = cost_tracker
         self.log_path = log_path
+        self.clients = clients or ClientRegistry(config)
+        self.cache = cache
 
     def _log_api(
         self,
@@ -25,25 +81,201 @@ class BaseAgent:
         cost: float,
         success: bool,
         error: str | None = None,
+        cached: bool = False,
+        cache_write_tokens: int = 0,
+        cache_read_tokens: int = 0,
     ) -> None:
         line = (
             f"{datetime.utcnow().isoformat()} | model={model} | step={step} | section={section} | "
             f"input_tokens={input_tokens} | output_tokens={output_tokens} | cost={cost:.6f} | success={success}"
         )
+        if cache_write_tokens or cache_read_tokens:
+            line += f" | cache_write_tokens={cache_write_tokens} | cache_read_tokens={cache_read_tokens}"
+        if cached:
+            line += " | cached=True"
         if error:
             line += f" | error={error}"
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
         with self.log_path.open("a", encoding="utf-8") as handle:
             handle.write(line + "\n")
 
-    def _call_with_retry(self, call_fn: Callable[[], T], step: str, section: int, attempts: int = 3) -> T:
-        delay = 2
-        for attempt in range(attempts):
+    def _rate_limiter(self, provider: str, model: str) -> RateLimiter | None:
+        rpm = getattr(self.config, f"{provider}_rpm", 0) if provider else 0
+        tpm = getattr(self.config, f"{provider}_tpm", 0) if provider else 0
+        if not rpm and not tpm:
+            return None
+        return get_rate_limiter(provider, model, rpm, tpm)
+
+    async def _call_with_retry(
+        self, call_fn: Callable[[], Awaitable[T]], step: str, section: int, provider: str = ""
+    ) -> T:
+        """Call with retries chosen by error class (see ``agents.retry``).
+
+        Client errors such as a bad key or an oversized prompt fail at once. With a
+        ``provider``, calls also go through that provider's shared circuit breaker.
+        """
+        breaker = (
+            get_circuit_breaker(provider, self.config.circuit_threshold, self.config.circuit_cooldown)
+            if provider
+            else None
+        )
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.before_call()
             try:
-                return call_fn()
-            except Exception:
-                if attempt == attempts - 1:
+                result = await call_fn()
+            except Exception as exc:
+                kind = classify_error(exc)
+                if breaker is not None:
+                    breaker.record_failure(kind)
+                policy = RETRY_POLICIES[kind]
+                if attempt + 1 >= policy.attempts:
                     raise
-                time.sleep(delay)
-                delay *= 2
-        raise RuntimeError(f"Retry loop failed unexpectedly for {step} section {section}.")
+                delay = policy.delay(attempt, retry_after(exc))
+                await asyncio.to_thread(self._log_retry, step, section, kind, delay, exc)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+    def _log_retry(self, step: str, section: int, kind: str, delay: float, exc: Exception) -> None:
+        line = (
+            f"{datetime.utcnow().isoformat()} | retry | step={step} | section={section} | "
+            f"kind={kind} | delay={delay:.1f}s | error={exc}"
+        )
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.log_path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+    def _record_call(
+        self,
+        model: str,
+        step: str,
+        section: int,
+        input_tokens: int,
+        output_tokens: int,
+        cached: bool = False,
+        cache_write_tokens: int = 0,
+        cache_read_tokens: int = 0,
+    ) -> float:
+        """Append a successful call to the cost ledger and the API log; returns its cost.
+
+        The ledger append fsyncs under a file lock, so async callers run this in a
+        worker thread (``asyncio.to_thread``) rather than on the shared event loop.
+        """
+        cost = self.cost_tracker.log_api_call(
+            model, input_tokens, output_tokens, section, step, cached=cached,
+            cache_write_tokens=cache_write_tokens, cache_read_tokens=cache_read_tokens,
+        )
+        self._log_api(
+            model, step, section, input_tokens, output_tokens, cost, True, cached=cached,
+            cache_write_tokens=cache_write_tokens, cache_read_tokens=cache_read_tokens,
+        )
+        return cost
+
+    async def _complete(
+        self,
+        model: str,
+        step: str,
+        section: int,
+        call_fn: Callable[[], Awaitable[Any]],
+        parse_fn: Callable[[Any], tuple[str, int, int]],
+        provider: str = "",
+        system: str = "",
+        prompt: str = "",
+        max_tokens: int = 0,
+    ) -> str:
+        """Call a provider with retry, then record usage and cost for the step.
+
+        ``parse_fn`` turns the provider response into ``(text, input_tokens, output_tokens)``,
+        optionally followed by ``cache_write_tokens, cache_read_tokens`` for prompt caching.
+        When ``provider`` is given and a response cache is attached, an identical earlier
+        request is answered from disk and logged at $0. Otherwise the call waits on the
+        provider's shared rate limiter, sized by the estimated prompt plus ``max_tokens``.
+        """
+        cache_key = None
+        if self.cache is not None and provider:
+            cache_key = self.cache.make_key(provider, model, system, prompt, max_tokens)
+            hit = await asyncio.to_thread(self.cache.get, cache_key)
+            if hit is not None:
+                await asyncio.to_thread(
+                    self._record_call, model, step, section, hit["input_tokens"], hit["output_tokens"], cached=True
+                )
+                return hit["text"]
+
+        limiter = self._rate_limiter(provider, model)
+        estimated = estimate_tokens(system, prompt) + max_tokens
+
+        reserved = 0
+
+        async def _limited_call():
+            # Every attempt, retries included, waits for its share of the quota.
+            nonlocal reserved
+            if limiter is not None:
+                reserved += await limiter.acquire(estimated)
+            return await call_fn()
+
+        try:
+            response = await self._call_with_retry(_limited_call, step, section, provider)
+            text, input_tokens, output_tokens, *cache_usage = parse_fn(response)
+        except Exception as exc:
+            if limiter is not None:
+                # The failed attempts' estimates would otherwise throttle the calls that follow.
+                limiter.settle(reserved, 0)
+            await asyncio.to_thread(self._log_api, model, step, section, 0, 0, 0.0, False, str(exc))
+            raise
+        cache_write, cache_read = cache_usage or (0, 0)
+        used = input_tokens + cache_write + cache_read + output_tokens
+        if limiter is not None and used:
+            # No reported usage leaves the estimate in place.
+            limiter.settle(reserved, used)
+        await asyncio.to_thread(
+            self._record_call, model, step, section, input_tokens, output_tokens,
+            cache_write_tokens=cache_write, cache_read_tokens=cache_read,
+        )
+        if cache_key is not None and text:
+            await asyncio.to_thread(self.cache.put, cache_key, text, input_tokens, output_tokens, provider, model)
+        return text
+
+    @staticmethod
+    def _anthropic_usage(usage) -> tuple[int, int, int, int]:
+        """``(input, output, cache_write, cache_read)`` tokens; input excludes the cached parts."""
+        return (
+            getattr(usage, "input_tokens", 0) or 0,
+            getattr(usage, "output_tokens", 0) or 0,
+            getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            getattr(usage, "cache_read_input_tokens", 0) or 0,
+        )
+
+    @classmethod
+    def _parse_anthropic(cls, response) -> tuple[str, int, int, int, int]:
+        return (response.content[0].text, *cls._anthropic_usage(response.usage))
+
+    @staticmethod
+    def _parse_openai_chat(response) -> tuple[str, int, int]:
+        text = response.choices[0].message.content
+        usage = getattr(response, "usage", None)
+        input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        output_tokens = getattr(usage, "completion_tokens", 0) or 0
+        return text, input_tokens, output_tokens
+
+    @staticmethod
+    def _parse_gemini(response) -> tuple[str, int, int]:
+        text = getattr(response, "text", "") or ""
+        usage = getattr(response, "usage_metadata", None) or getattr(response, "usage", None)
+        input_tokens = (
+            getattr(usage, "prompt_token_count", 0)
+            or getattr(usage, "input_tokens", 0)
+            or getattr(usage, "prompt_tokens", 0)
+            or 0
+        )
+        output_tokens = (
+            getattr(usage, "candidates_token_count", 0)
+            or getattr(usage, "output_tokens", 0)
+            or getattr(usage, "completion_tokens", 0)
+            or 0
+        )
+        return text, input_tokens, output_tokens
@@ -0,0 +1,93 @@
+"""Gemini batch API client for the research and review steps.
+
+A batch job takes many ``generateContent`` requests at once, runs them within
+the provider's batch window and bills them at half price. Each request carries
+a ``key`` in its metadata so results can be matched back to their section no
+matter what order the job returns them in.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from agents.base_agent import BaseAgent, run_sync
+
+TERMINAL_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+
+def _state_name(state) -> str:
+    return getattr(state, "value", None) or str(state or "JOB_STATE_UNSPECIFIED")
+
+
+class Batcher(BaseAgent):
+    def __init__(self, config, exporter, cost_tracker, log_path: Path, clients=None, cache=None):
+        super().__init__(config, exporter, cost_tracker, log_path, clients, cache)
+
+    def submit(self, model: str, step: str, requests: list[dict]) -> str:
+        return run_sync(self.submit_async(model, step, requests))
+
+    async def submit_async(self, model: str, step: str, requests: list[dict]) -> str:
+        """Create one batch job and return its name.
+
+        Each request is ``{"key", "prompt", "system"}``; ``system`` may be empty.
+        """
+        client = self.clients.gemini()
+        src = []
+        for request in requests:
+            inlined = {"contents": request["prompt"], "metadata": {"key": request["key"]}}
+            if request["system"]:
+                inlined["config"] = {"system_instruction": request["system"]}
+            src.append(inlined)
+
+        async def _call():
+            return await client.aio.batches.create(
+                model=model, src=src, config={"display_name": f"bookforge-{step}"}
+            )
+
+        job = await self._call_with_retry(_call, f"batch-{step}", 0, "gemini")
+        return job.name
+
+    def poll(self, name: str) -> tuple[str, dict[str, dict]]:
+        return run_sync(self.poll_async(name))
+
+    async def poll_async(self, name: str) -> tuple[str, dict[str, dict]]:
+        """Return the job state and, once it has finished, its results by request key.
+
+        A result is ``{"response": ...}`` or ``{"error": "..."}``.
+        """
+        client = self.clients.gemini()
+
+        async def _call():
+            return await client.aio.batches.get(name=name)
+
+        job = await self._call_with_retry(_call, "batch-poll", 0, "gemini")
+        state = _state_name(job.state)
+        results: dict[str, dict] = {}
+        if state not in TERMINAL_STATES:
+            return state, results
+        for item in getattr(job.dest, "inlined_responses", None) or []:
+            key = (item.metadata or {}).get("key")
+            if key is None:
+                continue
+            if item.error is not None or item.response is None:
+                message = getattr(item.error, "message", None) or "no response"
+                results[key] = {"error": message}
+            else:
+                results[key] = {"response": item.response}
+        return state, results
+
+    def record_result(self, model: str, step: str, section: int, response) -> str:
+        """Log usage and batch-priced cost for one result and return its text."""
+        text, input_tokens, output_tokens = self._parse_gemini(response)
+        cost = self.cost_tracker.log_api_call(model, input_tokens, output_tokens, section, step, batch=True)
+        self._log_api(model, step, section, input_tokens, output_tokens, cost, True)
+        return text
+
+    def record_failure(self, model: str, step: str, section: int, error: str) -> None:
+        self._log_api(model, step, section, 0, 0, 0.0, False, error)
@@ -0,0 +1,83 @@
+"""Shared provider SDK clients.
+
+Constructing an SDK client builds a fresh HTTP connection pool, so a client
+made per call pays for a new TCP/TLS handshake every time. The registry
+creates each client once, on first use, and hands the same instance to every
+agent. The SDKs keep idle connections alive inside that pool, so batch drafts
+and multi-section runs reuse warm connections.
+
+The SDKs' built-in retries are turned off; ``BaseAgent._call_with_retry`` owns
+retrying so attempts are not multiplied and the circuit breaker sees every failure.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+
+class ClientRegistry:
+    """Lazily created, long-lived Anthropic, OpenAI and Gemini clients."""
+
+    def __init__(self, config):
+        self.config = config
+        self._clients: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            if name not in self._clients:
+                self._clients[name] = factory()
+            return self._clients[name]
+
+    def anthropic(self):
+        from anthropic import Anthropic
+
+        return self._get(
+            "anthropic",
+            lambda: Anthropic(
+                api_key=self.config.anthropic_api_key, timeout=self.config.api_timeout, max_retries=0
+            ),
+        )
+
+    def async_anthropic(self):
+        from anthropic import AsyncAnthropic
+
+        return self._get(
+            "async_anthropic",
+            lambda: AsyncAnthropic(
+                api_key=self.config.anthropic_api_key, timeout=self.config.api_timeout, max_retries=0
+            ),
+        )
+
+    def openai(self):
+        from openai import OpenAI
+
+        return self._get(
+            "openai",
+            lambda: OpenAI(
+                api_key=self.config.openai_api_key, timeout=self.config.api_timeout, max_retries=0
+            ),
+        )
+
+    def async_openai(self):
+        from openai import AsyncOpenAI
+
+        return self._get(
+            "async_openai",
+            lambda: AsyncOpenAI(
+                api_key=self.config.openai_api_key, timeout=self.config.api_timeout, max_retries=0
+            ),
+        )
+
+    def gemini(self):
+        """google-genai client; use ``.aio`` on it for async calls."""
+        from google import genai
+
+        return self._get(
+            "gemini",
+            lambda: genai.Client(
+                api_key=self.config.google_api_key,
+                http_options={"timeout": int(self.config.api_timeout * 1000)},
+            ),
+        )
@@ -1,22 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 from pathlib import Path
 
-from openai import OpenAI
-
-from agents.base_agent import BaseAgent
+from agents.base_agent import BaseAgent, run_sync
 
 
 class ImageGenerator(BaseAgent):
     def generate_images(self, manifest: list[dict], chapter_dir: Path) -> list[Path]:
+        return run_sync(self.generate_images_async(manifest, chapter_dir))
+
+    async def generate_images_async(self, manifest: list[dict], chapter_dir: Path) -> list[Path]:
         if not manifest:
             return []
 
         output_dir = chapter_dir / "graphics"
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        client = OpenAI(api_key=self.config.openai_api_key)
+        client = self.clients.async_openai()
         created = []
 
         for item in manifest:
@@ -27,8 +29,8 @@ class ImageGenerator(BaseAgent):
                 created.append(target_path)
                 continue
 
-            def _call():
-                return client.images.generate(
+            async def _call():
+                return await client.images.generate(
                     model=self.config.image_model,
                     prompt=prompt,
                     n=1,
@@ -39,13 +41,18 @@ class ImageGenerator(BaseAgent):
                 )
 
             try:
-                response = self._call_with_retry(_call, "graphics", int(item.get("section", 0)))
+                response = await self._call_with_retry(_call, "graphics", int(item.get("section", 0)), "openai")
                 payload = response.data[0].b64_json
-                target_path.write_bytes(base64.b64decode(payload))
-                self._log_api(self.config.image_model, "graphics", int(item.get("section", 0)), 0, 0, 0.0, True)
+                await asyncio.to_thread(target_path.write_bytes, base64.b64decode(payload))
+                await asyncio.to_thread(
+                    self._log_api, self.config.image_model, "graphics", int(item.get("section", 0)), 0, 0, 0.0, True
+                )
                 created.append(target_path)
             except Exception as exc:
-                self._log_api(self.config.image_model, "graphics", int(item.get("section", 0)), 0, 0, 0.0, False, str(exc))
+                await asyncio.to_thread(
+                    self._log_api, self.config.image_model, "graphics", int(item.get("section", 0)), 0, 0, 0.0, False,
+                    str(exc),
+                )
                 raise
 
         return created
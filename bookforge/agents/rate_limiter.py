@@ -0,0 +1,97 @@
+"""Process-wide request and token rate limiting per provider and model.
+
+Each (provider, model) pair gets one ``RateLimiter`` shared by every agent in the
+process, so parallel sections draw from the same quota instead of each tripping
+the provider's limit and backing off on its own. Callers reserve capacity before
+sending a request and wait, in arrival order, until the reservation is covered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+
+class _Bucket:
+    """Token bucket refilled continuously at ``per_minute / 60`` per second.
+
+    Reservations may drive the level negative; the caller then waits until the
+    refill brings it back to zero. Later callers queue behind earlier ones.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take ``amount`` and return the seconds to wait before it is available."""
+        self._refill(now)
+        self.level -= amount
+        return max(0.0, -self.level / self.rate)
+
+    def adjust(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.capacity, self.level - amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one provider model.
+
+    A limit of 0 disables that dimension.
+    """
+
+    def __init__(self, rpm: float = 0, tpm: float = 0):
+        self.requests = _Bucket(rpm) if rpm > 0 else None
+        self.tokens = _Bucket(tpm) if tpm > 0 else None
+        self._lock = threading.Lock()
+
+    async def acquire(self, tokens: int) -> int:
+        """Wait until one request of roughly ``tokens`` tokens fits within both limits.
+
+        Returns the tokens actually reserved, which is what ``settle`` must correct.
+        """
+        reserved = 0
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1, now))
+            if self.tokens is not None:
+                # A request larger than a full minute of quota still has to go out eventually.
+                reserved = min(tokens, int(self.tokens.capacity))
+                wait = max(wait, self.tokens.reserve(reserved, now))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return reserved
+
+    def settle(self, reserved: int, actual: int) -> None:
+        """Correct the token bucket once the provider reports what a request really used.
+
+        ``reserved`` is the total returned by every ``acquire`` made for the request,
+        retries included, so reservations for failed attempts are given back too.
+        A request that failed outright settles with ``actual`` 0, returning it all.
+        """
+        if self.tokens is None or actual == reserved:
+            return
+        with self._lock:
+            self.tokens.adjust(actual - reserved, time.monotonic())
+
+
+_LIMITERS: dict[tuple[str, str], RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(provider: str, model: str, rpm: float = 0, tpm: float = 0) -> RateLimiter:
+    """Return the process-wide limiter for ``provider``/``model``, creating it on first use."""
+    with _LIMITERS_LOCK:
+        key = (provider, model)
+        if key not in _LIMITERS:
+            _LIMITERS[key] = RateLimiter(rpm, tpm)
+        return _LIMITERS[key]
@@ -52,11 +52,15 @@ class ReadabilityAnalyzer:
             "word-for-word": "verbatim",
         }
         report.append("## Terminology Violations")
+        # One pass over the chapter for all terms; reported term by term as before.
+        pattern = re.compile("|".join(map(re.escape, prohibited)), flags=re.IGNORECASE)
+        order = {bad: number for number, bad in enumerate(prohibited)}
+        hits = sorted(pattern.finditer(text), key=lambda match: (order[match.group().lower()], match.start()))
         violations = []
-        for bad, good in prohibited.items():
-            for match in re.finditer(re.escape(bad), text, flags=re.IGNORECASE):
-                line = text[max(0, match.start() - 40) : match.end() + 40].replace("\n", " ")
-                violations.append(f"- '{bad}' -> use '{good}' | ...{line}...")
+        for match in hits:
+            bad = match.group().lower()
+            line = text[max(0, match.start() - 40) : match.end() + 40].replace("\n", " ")
+            violations.append(f"- '{bad}' -> use '{prohibited[bad]}' | ...{line}...")
         report.extend(violations or ["- None"])
         report.append("")
 
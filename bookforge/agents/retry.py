@@ -0,0 +1,175 @@
+"""Retry policies and circuit breaking for provider calls.
+
+Errors are classified by HTTP status and exception type rather than by SDK
+class, so the same rules cover the Anthropic, OpenAI and google-genai clients
+without importing any of them:
+
+- ``rate_limit``: 429, retried patiently, honoring ``Retry-After`` hints.
+- ``overload``: 5xx and Anthropic's 529, retried with backoff.
+- ``timeout``: timeouts and dropped connections, retried quickly.
+- ``client_error``: any other 4xx (bad key, context too long, bad request), never retried.
+
+Unrecognized exceptions are retried like timeouts. Each provider also has a
+process-wide ``CircuitBreaker``. After repeated overloads or timeouts it opens
+and fails calls immediately for a cooldown, so a provider outage does not stall
+every queued section behind a full retry schedule.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+RATE_LIMIT = "rate_limit"
+OVERLOAD = "overload"
+TIMEOUT = "timeout"
+CLIENT_ERROR = "client_error"
+UNKNOWN = "unknown"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int
+    base_delay: float
+    max_delay: float
+
+    def delay(self, attempt: int, hint: float | None = None) -> float:
+        """Seconds to wait after failed ``attempt`` (0-based), using full jitter.
+
+        A server hint is treated as a floor: never retry sooner than asked, even
+        when that is longer than ``max_delay``, which only bounds the backoff.
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        if hint is not None:
+            return max(hint, backoff)
+        return backoff
+
+
+RETRY_POLICIES = {
+    RATE_LIMIT: RetryPolicy(attempts=6, base_delay=5.0, max_delay=90.0),
+    OVERLOAD: RetryPolicy(attempts=5, base_delay=4.0, max_delay=60.0),
+    TIMEOUT: RetryPolicy(attempts=3, base_delay=2.0, max_delay=30.0),
+    UNKNOWN: RetryPolicy(attempts=3, base_delay=2.0, max_delay=30.0),
+    CLIENT_ERROR: RetryPolicy(attempts=1, base_delay=0.0, max_delay=0.0),
+}
+
+_TRANSIENT_NAMES = ("Timeout", "Connection", "RemoteProtocol", "ReadError", "WriteError", "DeadlineExceeded")
+
+
+def _status_code(exc: BaseException) -> int | None:
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None) or getattr(response, "status", None)
+    return value if isinstance(value, int) else None
+
+
+def classify_error(exc: BaseException) -> str:
+    status = _status_code(exc)
+    if status == 429:
+        return RATE_LIMIT
+    if status is not None and (status >= 500 or status == 408):
+        return OVERLOAD
+    if status is not None and 400 <= status < 500:
+        return CLIENT_ERROR
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return TIMEOUT
+    if any(name in cls.__name__ for cls in type(exc).__mro__ for name in _TRANSIENT_NAMES):
+        return TIMEOUT
+    return UNKNOWN
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Server-requested wait in seconds, from response headers or a Gemini RetryInfo detail."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after-ms")
+        if value:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                pass
+        value = headers.get("retry-after")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+    match = re.search(r"retryDelay['\"]?\s*:\s*['\"]?(\d+(?:\.\d+)?)s", str(getattr(exc, "details", "")))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one provider.
+
+    Closed: calls pass. After ``threshold`` consecutive overloads or timeouts it
+    opens and rejects calls for ``cooldown`` seconds. The first call after the
+    cooldown is a trial: success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, name: str, threshold: int = 5, cooldown: float = 60.0):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.opened_at + self.cooldown - time.monotonic()
+            if remaining > 0 or self._trial_running:
+                wait = max(remaining, 0.0)
+                raise CircuitOpenError(
+                    f"{self.name} circuit is open after {self.failures} consecutive failures; "
+                    f"not retrying for another {wait:.0f}s."
+                )
+            self._trial_running = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self, kind: str) -> None:
+        # Rate limits and bad requests say nothing about whether the provider is up.
+        if kind not in (OVERLOAD, TIMEOUT):
+            with self._lock:
+                self._trial_running = False
+            return
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(provider: str, threshold: int = 5, cooldown: float = 60.0) -> CircuitBreaker:
+    """Return the process-wide breaker for ``provider``, creating it on first use."""
+    with _BREAKERS_LOCK:
+        if provider not in _BREAKERS:
+            _BREAKERS[provider] = CircuitBreaker(provider, threshold, cooldown)
+        return _BREAKERS[provider]
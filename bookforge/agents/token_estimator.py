@@ -0,0 +1,55 @@
+"""Pre-flight token estimates for sizing requests before they are sent.
+
+The estimates are deliberately conservative (slightly more tokens than the
+providers will count) so a request judged to fit really does fit. They need
+no network call and no tokenizer dependency.
+"""
+
+from __future__ import annotations
+
+import math
+
+# English prose with Markdown averages ~4 characters per token; 3.5 leaves headroom
+# for transcript excerpts, citations and numbers, which tokenize less efficiently.
+CHARS_PER_TOKEN = 3.5
+
+# Tokens per word of generated book prose, including Markdown and code blocks.
+TOKENS_PER_WORD = 1.5
+
+CONTEXT_WINDOWS = {
+    "claude": 200_000,
+    "gpt": 128_000,
+    "gemini": 1_000_000,
+}
+DEFAULT_CONTEXT_WINDOW = 128_000
+
+# Room left for message framing and estimate error.
+SAFETY_MARGIN = 2_000
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Estimate the combined token count of one or more prompt strings."""
+    return sum(math.ceil(len(text) / CHARS_PER_TOKEN) for text in texts if text)
+
+
+def tokens_for_words(words: int) -> int:
+    """Output tokens needed to generate roughly ``words`` words."""
+    return int(words * TOKENS_PER_WORD)
+
+
+def context_window(model: str) -> int:
+    model_lower = model.lower()
+    for family, window in CONTEXT_WINDOWS.items():
+        if family in model_lower:
+            return window
+    return DEFAULT_CONTEXT_WINDOW
+
+
+def output_budget(model: str, input_tokens: int) -> int:
+    """Largest ``max_tokens`` that still fits the model's context alongside the input."""
+    return context_window(model) - input_tokens - SAFETY_MARGIN
+
+
+def size_max_tokens(model: str, input_tokens: int, desired: int, floor: int, ceiling: int) -> int:
+    """Clamp a desired output size to ``[floor, ceiling]`` and to what the context window allows."""
+    return max(1, min(max(desired, floor), ceiling, output_budget(model, input_tokens)))
@@ -1,17 +1,102 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import time
 from pathlib import Path
-from typing import Optional
-
-from anthropic import Anthropic
+from typing import Awaitable, Callable, Optional
 
 from prompts.master_writer import MASTER_WRITER_PROMPT
-from agents.base_agent import BaseAgent
+from agents.base_agent import BaseAgent, run_sync
+from agents.token_estimator import estimate_tokens, output_budget, size_max_tokens, tokens_for_words
+
+# Claude output bounds for a single draft or revision request.
+MIN_OUTPUT_TOKENS = 8000
+MAX_OUTPUT_TOKENS = 32000
+# A revised subsection picks up expansions and examples, so it outgrows the draft.
+REVISION_GROWTH = 1.5
+SUBSECTION_MIN_OUTPUT_TOKENS = 2000
+
+# The master prompt is identical on every call; mark it for Anthropic prompt caching
+# so repeat calls within the cache lifetime read it at a tenth of the input price.
+_CACHED_SYSTEM = [{"type": "text", "text": MASTER_WRITER_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+# Inline prompt text. The orchestrator fingerprints these with the prompt templates,
+# so editing them re-runs the draft and revision steps like a template change does.
+DRAFT_REMINDERS = (
+    "REMINDERS (enforce these throughout your output):",
+    "- Write in PROSE PARAGRAPHS. Bullet lists are NOT acceptable for body content.",
+    "- Every subsection needs: bold rule → story/stakes → transcript example.",
+    "- Open the section with a 2–3 paragraph narrative SCENE, not a summary.",
+    "- Transitions between subsections are natural sentences, never labels.",
+    "- Maximum 1–2 callouts per subsection. Use blockquote format.",
+    "- No fabricated case citations. If uncertain, describe the scenario generically.",
+    "- This is a book for VOICE WRITERS. No steno machines. No CSR credentials.",
+    "- The output must read like a published book chapter, not a training manual.",
+)
+REVISION_INSTRUCTIONS = (
+    "Revise this chapter draft into a PUBLICATION-READY book chapter.\n\n"
+    "YOUR TASK: Take the current draft and produce a final version that reads like a "
+    "professionally authored reference book. Apply all feedback from the expansion review, "
+    "fact-check report, and quality review.\n\n"
+    "CRITICAL REVISION PRIORITIES (in order):\n\n"
+    "1. PROSE QUALITY: Every section must flow as authored prose. Convert any remaining "
+    "bullet lists into flowing paragraphs. Add narrative transitions. Ensure every "
+    "subsection tells a story, not just states rules.\n\n"
+    "2. REMOVE ALL SCAFFOLDING: Delete every instance of 'Layer 1 — The Rule:', "
+    "'Layer 2 — Why It Matters:', 'Layer 3 — Transcript Example:', 'Bridge:', "
+    "and '[CALLOUT: ...]' markers. Replace with natural prose and blockquote callouts.\n\n"
+    "3. FIX OPENINGS: If any 'From the Record' opening is a one-line summary, "
+    "rewrite it as a 2–3 paragraph narrative scene with setting, tension, and stakes.\n\n"
+    "4. CORRECT FACTS: Apply all corrections from the fact-check report. Remove or "
+    "replace any FABRICATED or INCORRECT items. Keep all VERIFIED items.\n\n"
+    "5. INCORPORATE EXPANSIONS: Add the best content suggestions from the expansion "
+    "review — additional transcript examples, deeper stakes, stronger stories.\n\n"
+    "6. CALLOUT DISCIPLINE: Maximum 1–2 per subsection. Never stack them. Always "
+    "2+ paragraphs of prose between callouts. Use blockquote format.\n\n"
+    "7. TERMINOLOGY: 'voice writer' (not stenomask reporter), 'digital reporter' "
+    "(not electronic reporter), 'speech recognition engine' (not voice recognition), "
+    "'impartiality' (not fairity). Remove any steno machine references.\n\n"
+    "8. COMPLETENESS: Ensure the section opens with a From the Record story, ends "
+    "with From the Record: Real-World Examples, and includes 2–3 Practice Challenges.\n\n"
+)
+REVISION_CLOSING = (
+    "OUTPUT: The complete revised chapter as clean Markdown. It must read like a "
+    "published book — not a manual, not an academic paper, not a government report. "
+    "A voice writer should want to read this cover to cover."
+)
+SUBSECTION_REVISION_INSTRUCTIONS = (
+    "Revise a single subsection of this chapter into publication-ready prose.\n\n"
+    "RULES: Write flowing prose (no bullet lists). Remove all scaffolding labels. "
+    "Fix any fact-check issues. Ensure rule → stakes → transcript example rhythm "
+    "is present but invisible. Maximum 1–2 callouts as blockquotes. "
+    "Voice writer terminology only. Must read like a published book.\n\n"
+)
+
+
+async def _run_all(coros: list[Awaitable[str]]) -> list[str]:
+    """Run chunk requests concurrently; if one fails, cancel the rest and raise its error.
+
+    ``asyncio.gather`` would leave the other chunks streaming (and billing) for output
+    that is thrown away anyway.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+    except ExceptionGroup as errors:
+        raise errors.exceptions[0]
+    return [task.result() for task in tasks]
+
+
+def partial_prompt_path(partial_path: Path) -> Path:
+    """Sidecar holding the hash of the request a ``.partial`` file was streamed for."""
+    return partial_path.with_name(partial_path.name + ".prompt-sha256")
 
 
 class Writer(BaseAgent):
-    def __init__(self, config, exporter, cost_tracker, log_path: Path):
-        super().__init__(config, exporter, cost_tracker, log_path)
+    def __init__(self, config, exporter, cost_tracker, log_path: Path, clients=None, cache=None):
+        super().__init__(config, exporter, cost_tracker, log_path, clients, cache)
 
     def _build_draft_prompt(
         self,
@@ -61,15 +146,7 @@ class Writer(BaseAgent):
             parts.append("")
 
         # Reinforcement block — prevents common AI writing failures
-        parts.append("REMINDERS (enforce these throughout your output):")
-        parts.append("- Write in PROSE PARAGRAPHS. Bullet lists are NOT acceptable for body content.")
-        parts.append("- Every subsection needs: bold rule → story/stakes → transcript example.")
-        parts.append("- Open the section with a 2–3 paragraph narrative SCENE, not a summary.")
-        parts.append("- Transitions between subsections are natural sentences, never labels.")
-        parts.append("- Maximum 1–2 callouts per subsection. Use blockquote format.")
-        parts.append("- No fabricated case citations. If uncertain, describe the scenario generically.")
-        parts.append("- This is a book for VOICE WRITERS. No steno machines. No CSR credentials.")
-        parts.append("- The output must read like a published book chapter, not a training manual.")
+        parts.extend(DRAFT_REMINDERS)
 
         if additional_context:
             parts.append("")
@@ -77,6 +154,161 @@ class Writer(BaseAgent):
 
         return "\n".join(parts)
 
+    @staticmethod
+    def _fit_problem(model: str, prompt: str, words: int) -> str:
+        """Which limit stops a request for ``words`` words from fitting one call (see ``_plan_max_tokens``)."""
+        input_tokens = estimate_tokens(MASTER_WRITER_PROMPT, prompt)
+        needed = tokens_for_words(words)
+        if needed > MAX_OUTPUT_TOKENS:
+            return f"needs about {needed:,} output tokens, over the {MAX_OUTPUT_TOKENS:,}-token cap per request"
+        return (
+            f"needs about {needed:,} output tokens, but its ~{input_tokens:,}-token prompt leaves only "
+            f"{max(output_budget(model, input_tokens), 0):,} in the {model} context window"
+        )
+
+    def _plan_max_tokens(
+        self, model: str, prompt: str, words: int, floor: int = MIN_OUTPUT_TOKENS
+    ) -> int | None:
+        """``max_tokens`` for a request expected to produce ``words`` words, or None if it cannot fit one call."""
+        input_tokens = estimate_tokens(MASTER_WRITER_PROMPT, prompt)
+        needed = tokens_for_words(words)
+        if needed > MAX_OUTPUT_TOKENS or needed > output_budget(model, input_tokens):
+            return None
+        return size_max_tokens(model, input_tokens, needed, floor, MAX_OUTPUT_TOKENS)
+
+    def _plan_draft_batches(
+        self,
+        section: dict,
+        research_content: str,
+        additional_context: str,
+        source_material: str,
+        model: str,
+    ) -> list[tuple[str, int]]:
+        """Split the subsections into the fewest chunks whose prompts and outputs all fit.
+
+        Returns ``(prompt, max_tokens)`` per chunk. Raises ValueError when even a
+        single subsection is too large, since no batch size can help then.
+        """
+        subsections = section.get("subsections", [])
+        words_per_sub = section.get("word_target", 5000) // max(len(subsections), 1)
+        full_prompt = self._build_draft_prompt(section, research_content, additional_context, source_material)
+        problem = self._fit_problem(model, full_prompt, section.get("word_target", 5000))
+        for size in range(len(subsections) - 1, 0, -1):
+            batches = []
+            for i in range(0, len(subsections), size):
+                chunk = subsections[i : i + size]
+                prompt = self._build_draft_prompt(
+                    section, research_content, additional_context, source_material, subsections=chunk
+                )
+                max_tokens = self._plan_max_tokens(model, prompt, words_per_sub * len(chunk))
+                if max_tokens is None:
+                    problem = self._fit_problem(model, prompt, words_per_sub * len(chunk))
+                    break
+                batches.append((prompt, max_tokens))
+            else:
+                return batches
+        raise ValueError(
+            f"Section {section['number']} cannot be drafted in one request, even one subsection at a time: "
+            f"it {problem}. Trim the research or source material, or lower the word target, and retry."
+        )
+
+    @staticmethod
+    def _user_content(prompt: str, shared_prefix: str = ""):
+        """User message content; a ``shared_prefix`` reused across calls goes first, marked for caching."""
+        if not shared_prefix:
+            return prompt
+        return [
+            {"type": "text", "text": shared_prefix, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": prompt},
+        ]
+
+    def _message_call(
+        self,
+        client,
+        model: str,
+        max_tokens: int,
+        prompt: str,
+        partial_path: Path | None,
+        on_progress: Callable[[int], None] | None,
+        shared_prefix: str = "",
+    ):
+        """Return ``(call_fn, parse_fn)`` for one Claude request, streamed when ``partial_path`` is set."""
+        content = self._user_content(prompt, shared_prefix)
+        if partial_path is None:
+            async def _call():
+                return await client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    system=_CACHED_SYSTEM,
+                    messages=[{"role": "user", "content": content}],
+                )
+
+            return _call, self._parse_anthropic
+
+        async def _stream():
+            return await self._stream_message(client, model, max_tokens, content, partial_path, on_progress)
+
+        return _stream, lambda result: result
+
+    async def _stream_message(
+        self,
+        client,
+        model: str,
+        max_tokens: int,
+        content,
+        partial_path: Path,
+        on_progress: Callable[[int], None] | None,
+    ) -> tuple[str, int, int, int, int]:
+        """Stream a Claude response into ``partial_path`` and return its text and usage.
+
+        The usage tuple matches ``_parse_anthropic``.
+
+        Text is appended to the partial file as it arrives, so a timeout near the end
+        loses nothing. If the file already holds text from an interrupted attempt with the
+        same model and prompt, it is sent back as an assistant prefill and Claude continues
+        from there. The prompt's hash is kept next to it in ``<partial>.prompt-sha256``; a
+        partial written for a different prompt is discarded. Both files are removed once
+        the response completes.
+        """
+        partial_path.parent.mkdir(parents=True, exist_ok=True)
+        hash_path = partial_prompt_path(partial_path)
+        prompt_hash = hashlib.sha256(json.dumps([model, content], ensure_ascii=False).encode("utf-8")).hexdigest()
+        existing = ""
+        if partial_path.exists() and hash_path.exists() and hash_path.read_text(encoding="utf-8") == prompt_hash:
+            # The API rejects a prefill that ends in whitespace.
+            existing = partial_path.read_text(encoding="utf-8").rstrip()
+        messages = [{"role": "user", "content": content}]
+        if existing:
+            messages.append({"role": "assistant", "content": existing})
+        partial_path.write_text(existing, encoding="utf-8")
+        hash_path.write_text(prompt_hash, encoding="utf-8")
+
+        chunks = [existing]
+        last_report = 0.0
+        async with client.messages.stream(
+            model=model,
+            max_tokens=max_tokens,
+            system=_CACHED_SYSTEM,
+            messages=messages,
+        ) as stream:
+            with partial_path.open("a", encoding="utf-8") as handle:
+                async for text in stream.text_stream:
+                    handle.write(text)
+                    handle.flush()
+                    chunks.append(text)
+                    now = time.monotonic()
+                    if on_progress is not None and now - last_report >= 0.5:
+                        on_progress(len("".join(chunks).split()))
+                        last_report = now
+            message = await stream.get_final_message()
+
+        text = "".join(chunks)
+        if on_progress is not None:
+            on_progress(len(text.split()))
+        partial_path.unlink(missing_ok=True)
+        hash_path.unlink(missing_ok=True)
+        return (text, *self._anthropic_usage(message.usage))
+
     def draft_section(
         self,
         section: dict,
@@ -85,83 +317,83 @@ class Writer(BaseAgent):
         source_material: str = "",
         chapter_dir: Path | None = None,
         prompt_name: str = "writing-prompt.md",
+        partial_path: Path | None = None,
+        on_progress: Callable[[int], None] | None = None,
     ) -> str:
+        return run_sync(
+            self.draft_section_async(
+                section, research_content, additional_context, source_material, chapter_dir, prompt_name,
+                partial_path, on_progress,
+            )
+        )
+
+    async def draft_section_async(
+        self,
+        section: dict,
+        research_content: str = "",
+        additional_context: str = "",
+        source_material: str = "",
+        chapter_dir: Path | None = None,
+        prompt_name: str = "writing-prompt.md",
+        partial_path: Path | None = None,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> str:
+        """Draft a section with Claude.
+
+        When ``partial_path`` is given the response is streamed into that file as it
+        arrives (see ``_stream_message``) and ``on_progress`` receives the running word count.
+        """
         if chapter_dir is None:
             raise ValueError("chapter_dir is required for saving prompts.")
         prompt = self._build_draft_prompt(
             section, research_content, additional_context, source_material
         )
-        self.exporter.save_prompt(chapter_dir, prompt_name, prompt)
+        await asyncio.to_thread(self.exporter.save_prompt, chapter_dir, prompt_name, prompt)
 
-        client = Anthropic(api_key=self.config.anthropic_api_key)
+        client = self.clients.async_anthropic()
         model = self.config.claude_model
 
-        # Scale max_tokens to section size (roughly 1.3 tokens per word + overhead)
-        word_target = section.get("word_target", 5000)
-        max_tokens = min(max(int(word_target * 1.5), 8000), 32000)
-
-        def _call():
-            response = client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                system=MASTER_WRITER_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
+        # Size the request before sending it; batch up front if it cannot fit one call.
+        max_tokens = self._plan_max_tokens(model, prompt, section.get("word_target", 5000))
+        if max_tokens is None:
+            batches = self._plan_draft_batches(
+                section, research_content, additional_context, source_material, model
             )
-            return response
-
-        try:
-            response = self._call_with_retry(_call, "draft", section["number"])
-            text = response.content[0].text
-            input_tokens = getattr(response.usage, "input_tokens", 0)
-            output_tokens = getattr(response.usage, "output_tokens", 0)
-            cost = self.cost_tracker.log_api_call(model, input_tokens, output_tokens, section["number"], "draft")
-            self._log_api(model, "draft", section["number"], input_tokens, output_tokens, cost, True)
-            return text
-        except Exception as exc:
-            self._log_api(model, "draft", section["number"], 0, 0, 0.0, False, str(exc))
-            if "context" in str(exc).lower() and len(section.get("subsections", [])) > 1:
-                return self._draft_with_batches(
-                    section, research_content, additional_context, source_material, chapter_dir
-                )
-            raise
+            return await self._draft_with_batches(section, batches, chapter_dir)
+
+        call_fn, parse_fn = self._message_call(client, model, max_tokens, prompt, partial_path, on_progress)
+        return await self._complete(
+            model, "draft", section["number"], call_fn, parse_fn,
+            provider="anthropic", system=MASTER_WRITER_PROMPT, prompt=prompt, max_tokens=max_tokens,
+        )
 
-    def _draft_with_batches(
+    async def _draft_with_batches(
         self,
         section: dict,
-        research_content: str,
-        additional_context: str,
-        source_material: str,
+        batches: list[tuple[str, int]],
         chapter_dir: Path,
     ) -> str:
-        subsections = section.get("subsections", [])
-        chunks = [subsections[i : i + 3] for i in range(0, len(subsections), 3)]
-        outputs = []
-        for idx, chunk in enumerate(chunks, start=1):
-            prompt = self._build_draft_prompt(
-                section, research_content, additional_context, source_material, subsections=chunk
-            )
-            prompt_name = f"writing-prompt-part-{idx}.md"
-            self.exporter.save_prompt(chapter_dir, prompt_name, prompt)
-            client = Anthropic(api_key=self.config.anthropic_api_key)
-            model = self.config.claude_model
-
-            # Per-batch token allocation
-            words_per_sub = section.get("word_target", 5000) // max(len(subsections), 1)
-            batch_words = words_per_sub * len(chunk)
-            max_tokens = min(max(int(batch_words * 1.5), 8000), 32000)
-
-            response = client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                system=MASTER_WRITER_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            text = response.content[0].text
-            input_tokens = getattr(response.usage, "input_tokens", 0)
-            output_tokens = getattr(response.usage, "output_tokens", 0)
-            cost = self.cost_tracker.log_api_call(model, input_tokens, output_tokens, section["number"], f"draft-part-{idx}")
-            self._log_api(model, f"draft-part-{idx}", section["number"], input_tokens, output_tokens, cost, True)
-            outputs.append(text)
+        """Draft the planned chunks concurrently and stitch them back together in order.
+
+        At most ``config.writer_concurrency`` chunks are in flight at once. Each chunk
+        goes through ``_complete``, so it gets its own retry, cost entry and cache lookup.
+        """
+        client = self.clients.async_anthropic()
+        model = self.config.claude_model
+        limit = asyncio.Semaphore(self.config.writer_concurrency)
+
+        async def _draft_chunk(idx: int, prompt: str, max_tokens: int) -> str:
+            await asyncio.to_thread(self.exporter.save_prompt, chapter_dir, f"writing-prompt-part-{idx}.md", prompt)
+            call_fn, parse_fn = self._message_call(client, model, max_tokens, prompt, None, None)
+            async with limit:
+                return await self._complete(
+                    model, f"draft-part-{idx}", section["number"], call_fn, parse_fn,
+                    provider="anthropic", system=MASTER_WRITER_PROMPT, prompt=prompt, max_tokens=max_tokens,
+                )
+
+        outputs = await _run_all(
+            [_draft_chunk(idx, prompt, max_tokens) for idx, (prompt, max_tokens) in enumerate(batches, start=1)]
+        )
         return "\n\n".join(outputs)
 
     def revise_section(
@@ -174,35 +406,34 @@ class Writer(BaseAgent):
         human_notes: str = "",
         chapter_dir: Path | None = None,
         prompt_name: str = "revision-prompt.md",
+        partial_path: Path | None = None,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> str:
+        return run_sync(
+            self.revise_section_async(
+                section, draft, expansion_notes, fact_report, review_report, human_notes, chapter_dir, prompt_name,
+                partial_path, on_progress,
+            )
+        )
+
+    async def revise_section_async(
+        self,
+        section: dict,
+        draft: str,
+        expansion_notes: str,
+        fact_report: str,
+        review_report: str,
+        human_notes: str = "",
+        chapter_dir: Path | None = None,
+        prompt_name: str = "revision-prompt.md",
+        partial_path: Path | None = None,
+        on_progress: Callable[[int], None] | None = None,
     ) -> str:
         if chapter_dir is None:
             raise ValueError("chapter_dir is required for saving prompts.")
 
         prompt = (
-            "Revise this chapter draft into a PUBLICATION-READY book chapter.\n\n"
-            "YOUR TASK: Take the current draft and produce a final version that reads like a "
-            "professionally authored reference book. Apply all feedback from the expansion review, "
-            "fact-check report, and quality review.\n\n"
-            "CRITICAL REVISION PRIORITIES (in order):\n\n"
-            "1. PROSE QUALITY: Every section must flow as authored prose. Convert any remaining "
-            "bullet lists into flowing paragraphs. Add narrative transitions. Ensure every "
-            "subsection tells a story, not just states rules.\n\n"
-            "2. REMOVE ALL SCAFFOLDING: Delete every instance of 'Layer 1 — The Rule:', "
-            "'Layer 2 — Why It Matters:', 'Layer 3 — Transcript Example:', 'Bridge:', "
-            "and '[CALLOUT: ...]' markers. Replace with natural prose and blockquote callouts.\n\n"
-            "3. FIX OPENINGS: If any 'From the Record' opening is a one-line summary, "
-            "rewrite it as a 2–3 paragraph narrative scene with setting, tension, and stakes.\n\n"
-            "4. CORRECT FACTS: Apply all corrections from the fact-check report. Remove or "
-            "replace any FABRICATED or INCORRECT items. Keep all VERIFIED items.\n\n"
-            "5. INCORPORATE EXPANSIONS: Add the best content suggestions from the expansion "
-            "review — additional transcript examples, deeper stakes, stronger stories.\n\n"
-            "6. CALLOUT DISCIPLINE: Maximum 1–2 per subsection. Never stack them. Always "
-            "2+ paragraphs of prose between callouts. Use blockquote format.\n\n"
-            "7. TERMINOLOGY: 'voice writer' (not stenomask reporter), 'digital reporter' "
-            "(not electronic reporter), 'speech recognition engine' (not voice recognition), "
-            "'impartiality' (not fairity). Remove any steno machine references.\n\n"
-            "8. COMPLETENESS: Ensure the section opens with a From the Record story, ends "
-            "with From the Record: Real-World Examples, and includes 2–3 Practice Challenges.\n\n"
+            f"{REVISION_INSTRUCTIONS}"
             "---\n\n"
             "CURRENT DRAFT:\n"
             f"{draft}\n\n"
@@ -219,44 +450,26 @@ class Writer(BaseAgent):
             "AUTHOR NOTES:\n"
             f"{human_notes or 'No additional notes.'}\n\n"
             "---\n\n"
-            "OUTPUT: The complete revised chapter as clean Markdown. It must read like a "
-            "published book — not a manual, not an academic paper, not a government report. "
-            "A voice writer should want to read this cover to cover."
+            f"{REVISION_CLOSING}"
         )
-        self.exporter.save_prompt(chapter_dir, prompt_name, prompt)
+        await asyncio.to_thread(self.exporter.save_prompt, chapter_dir, prompt_name, prompt)
 
-        client = Anthropic(api_key=self.config.anthropic_api_key)
+        client = self.clients.async_anthropic()
         model = self.config.claude_model
 
-        word_target = section.get("word_target", 5000)
-        max_tokens = min(max(int(word_target * 1.5), 8000), 32000)
-
-        def _call():
-            response = client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                system=MASTER_WRITER_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
+        max_tokens = self._plan_max_tokens(model, prompt, section.get("word_target", 5000))
+        if max_tokens is None:
+            return await self._revise_with_batches(
+                section, draft, expansion_notes, fact_report, review_report, human_notes, chapter_dir
             )
-            return response
-
-        try:
-            response = self._call_with_retry(_call, "revise", section["number"])
-            text = response.content[0].text
-            input_tokens = getattr(response.usage, "input_tokens", 0)
-            output_tokens = getattr(response.usage, "output_tokens", 0)
-            cost = self.cost_tracker.log_api_call(model, input_tokens, output_tokens, section["number"], "revise")
-            self._log_api(model, "revise", section["number"], input_tokens, output_tokens, cost, True)
-            return text
-        except Exception as exc:
-            self._log_api(model, "revise", section["number"], 0, 0, 0.0, False, str(exc))
-            if "context" in str(exc).lower():
-                return self._revise_with_batches(
-                    section, draft, expansion_notes, fact_report, review_report, human_notes, chapter_dir
-                )
-            raise
 
-    def _revise_with_batches(
+        call_fn, parse_fn = self._message_call(client, model, max_tokens, prompt, partial_path, on_progress)
+        return await self._complete(
+            model, "revise", section["number"], call_fn, parse_fn,
+            provider="anthropic", system=MASTER_WRITER_PROMPT, prompt=prompt, max_tokens=max_tokens,
+        )
+
+    async def _revise_with_batches(
         self,
         section: dict,
         draft: str,
@@ -266,38 +479,65 @@ class Writer(BaseAgent):
         human_notes: str,
         chapter_dir: Path,
     ) -> str:
+        """Revise each ``### `` subsection concurrently and reassemble them under the header.
+
+        Every prompt is sized before any call is made, with ``max_tokens`` scaled to the
+        subsection's length. The rules and feedback reports are the same for every
+        subsection, so they form a shared prefix marked for prompt caching. The first
+        subsection runs alone to write that cache; the rest then run at most
+        ``config.writer_concurrency`` at a time and read it. Each call goes through
+        ``_complete`` for retry, caching and a revise-part-N cost entry.
+        """
         parts = draft.split("### ")
-        header = parts[0]
-        subsections = ["### " + part for part in parts[1:]] if len(parts) > 1 else [draft]
-        outputs = [header.strip()]
+        if len(parts) > 1:
+            header, subsections = parts[0], ["### " + part for part in parts[1:]]
+        else:
+            # No subsections: the whole draft is revised as one, with nothing above it.
+            header, subsections = "", [draft]
+        client = self.clients.async_anthropic()
+        model = self.config.claude_model
+
+        shared_context = (
+            f"{SUBSECTION_REVISION_INSTRUCTIONS}"
+            f"EXPANSION NOTES:\n{expansion_notes}\n\n"
+            f"FACT-CHECK:\n{fact_report}\n\n"
+            f"REVIEW:\n{review_report}\n\n"
+            f"AUTHOR NOTES:\n{human_notes or 'None.'}\n\n"
+        )
+        planned = []
         for idx, subsection in enumerate(subsections, start=1):
-            prompt = (
-                "Revise this single subsection into publication-ready prose.\n\n"
-                "RULES: Write flowing prose (no bullet lists). Remove all scaffolding labels. "
-                "Fix any fact-check issues. Ensure rule → stakes → transcript example rhythm "
-                "is present but invisible. Maximum 1–2 callouts as blockquotes. "
-                "Voice writer terminology only. Must read like a published book.\n\n"
-                f"SUBSECTION:\n{subsection}\n\n"
-                f"EXPANSION NOTES:\n{expansion_notes}\n\n"
-                f"FACT-CHECK:\n{fact_report}\n\n"
-                f"REVIEW:\n{review_report}\n\n"
-                f"AUTHOR NOTES:\n{human_notes or 'None.'}\n\n"
-                "OUTPUT: Revised subsection as clean Markdown."
+            prompt = f"SUBSECTION:\n{subsection}\n\nOUTPUT: Revised subsection as clean Markdown."
+            words = int(len(subsection.split()) * REVISION_GROWTH)
+            max_tokens = self._plan_max_tokens(
+                model, shared_context + prompt, words, floor=SUBSECTION_MIN_OUTPUT_TOKENS
             )
-            prompt_name = f"revision-prompt-part-{idx}.md"
-            self.exporter.save_prompt(chapter_dir, prompt_name, prompt)
-            client = Anthropic(api_key=self.config.anthropic_api_key)
-            model = self.config.claude_model
-            response = client.messages.create(
-                model=model,
-                max_tokens=16000,
-                system=MASTER_WRITER_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
+            if max_tokens is None:
+                problem = self._fit_problem(model, shared_context + prompt, words)
+                raise ValueError(
+                    f"Subsection {idx} of section {section['number']} cannot be revised in one request: "
+                    f"it {problem}. Trim the feedback reports or split the subsection and retry."
+                )
+            planned.append((prompt, max_tokens))
+
+        limit = asyncio.Semaphore(self.config.writer_concurrency)
+
+        async def _revise_part(idx: int, prompt: str, max_tokens: int) -> str:
+            await asyncio.to_thread(self.exporter.save_prompt, chapter_dir, f"revision-prompt-part-{idx}.md", shared_context + prompt)
+            call_fn, parse_fn = self._message_call(
+                client, model, max_tokens, prompt, None, None, shared_prefix=shared_context
             )
-            text = response.content[0].text
-            input_tokens = getattr(response.usage, "input_tokens", 0)
-            output_tokens = getattr(response.usage, "output_tokens", 0)
-            cost = self.cost_tracker.log_api_call(model, input_tokens, output_tokens, section["number"], f"revise-part-{idx}")
-            self._log_api(model, f"revise-part-{idx}", section["number"], input_tokens, output_tokens, cost, True)
-            outputs.append(text.strip())
+            async with limit:
+                text = await self._complete(
+                    model, f"revise-part-{idx}", section["number"], call_fn, parse_fn,
+                    provider="anthropic", system=MASTER_WRITER_PROMPT, prompt=shared_context + prompt,
+                    max_tokens=max_tokens,
+                )
+            return text.strip()
+
+        # A cache entry is only readable once the request that writes it has finished.
+        first = await _revise_part(1, *planned[0])
+        rest = await _run_all(
+            [_revise_part(idx, prompt, max_tokens) for idx, (prompt, max_tokens) in enumerate(planned[1:], start=2)]
+        )
+        outputs = [header.strip(), first, *rest]
         return "\n\n".join(output for output in outputs if output)
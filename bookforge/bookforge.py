@@ -12,9 +12,13 @@ from rich.panel import Panel
 from rich.table import Table
 from rich import box
 
-from config import load_config, ensure_log_dir, get_log_path
+from config import configured_status_backend, load_config, ensure_log_dir, get_log_path
+from agents.clients import ClientRegistry
 from pipeline.orchestrator import Pipeline
-from pipeline.status_tracker import StatusTracker
+from pipeline.scheduler import SectionScheduler
+from pipeline.batch_runner import BatchRunner
+from agents.batcher import TERMINAL_STATES
+from pipeline.status_tracker import open_status_tracker
 from pipeline.cost_tracker import CostTracker
 from exporters.book_exporter import BookExporter
 
@@ -54,12 +58,10 @@ def _check_env(console: Console) -> bool:
 
 def _test_apis(console: Console, config) -> None:
     console.print("[blue]Testing API connections...[/blue]")
+    clients = ClientRegistry(config)
     # Anthropic
     try:
-        from anthropic import Anthropic
-
-        client = Anthropic(api_key=config.anthropic_api_key)
-        client.messages.create(
+        clients.anthropic().messages.create(
             model=config.claude_model,
             max_tokens=8,
             system="You are a test.",
@@ -71,10 +73,7 @@ def _test_apis(console: Console, config) -> None:
 
     # OpenAI
     try:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=config.openai_api_key)
-        client.chat.completions.create(
+        clients.openai().chat.completions.create(
             model=config.openai_model,
             messages=[{"role": "user", "content": "Reply with OK."}],
             max_tokens=8,
@@ -86,9 +85,7 @@ def _test_apis(console: Console, config) -> None:
     # Gemini
     try:
         try:
-            from google import genai
-            client = genai.Client(api_key=config.google_api_key)
-            client.models.generate_content(model=config.gemini_model, contents="Reply with OK.")
+            clients.gemini().models.generate_content(model=config.gemini_model, contents="Reply with OK.")
         except Exception:
             import google.generativeai as genai
             genai.configure(api_key=config.google_api_key)
@@ -129,14 +126,165 @@ def init():
 @click.option("--only", "only_step", type=int, default=None, help="Run only a single step (0-8).")
 @click.option("--context", "additional_context", type=str, default="", help="Additional instructions for this session.")
 @click.option("--force", is_flag=True, help="Re-run all steps even if files exist.")
-def write(section_number: int, start_from: int, only_step: int | None, additional_context: str, force: bool):
+@click.option("--concurrent", is_flag=True, help="Run expand, fact-check and review (steps 2-4) in parallel.")
+@click.option("--no-cache", is_flag=True, help="Bypass the local response cache and call the APIs.")
+@click.option("--stream/--no-stream", default=None, help="Stream draft and revision output to drafts/*.partial.")
+@click.option("--salvage", is_flag=True, help="Use a leftover .partial draft or revision instead of calling Claude.")
+def write(
+    section_number: int,
+    start_from: int,
+    only_step: int | None,
+    additional_context: str,
+    force: bool,
+    concurrent: bool,
+    no_cache: bool,
+    stream: bool | None,
+    salvage: bool,
+):
     """Run the full pipeline for a section."""
     console = Console()
     config = load_config()
     ensure_log_dir(PROJECT_ROOT / "logs")
     log_path = get_log_path(PROJECT_ROOT / "logs")
-    pipeline = Pipeline(config, PROJECT_ROOT, log_path)
-    pipeline.run_full(section_number, additional_context, start_from, force, only_step)
+    pipeline = Pipeline(config, PROJECT_ROOT, log_path, use_cache=not no_cache, stream=stream)
+    pipeline.run_full(
+        section_number, additional_context, start_from, force, only_step, concurrent, salvage=salvage
+    )
+
+
+@cli.command(name="write-all")
+@click.argument("sections", type=int, nargs=-1)
+@click.option("--workers", type=int, default=3, show_default=True, help="Maximum sections to run at once.")
+@click.option("--from", "start_from", type=int, default=0, help="Resume each section from step (0-8).")
+@click.option("--context", "additional_context", type=str, default="", help="Additional instructions for this session.")
+@click.option("--force", is_flag=True, help="Re-run all steps even if files exist.")
+@click.option("--concurrent", is_flag=True, help="Run expand, fact-check and review (steps 2-4) in parallel.")
+@click.option("--fresh", is_flag=True, help="Ignore the previous run log and rebuild every section.")
+@click.option("--no-cache", is_flag=True, help="Bypass the local response cache and call the APIs.")
+@click.option("--stream/--no-stream", default=None, help="Stream draft and revision output to drafts/*.partial.")
+def write_all(
+    sections: tuple[int, ...],
+    workers: int,
+    start_from: int,
+    additional_context: str,
+    force: bool,
+    concurrent: bool,
+    fresh: bool,
+    no_cache: bool,
+    stream: bool | None,
+):
+    """Run the pipeline for all sections (or the given ones) in dependency order."""
+    console = Console()
+    config = load_config()
+    ensure_log_dir(PROJECT_ROOT / "logs")
+    log_path = get_log_path(PROJECT_ROOT / "logs")
+    pipeline = Pipeline(
+        config, PROJECT_ROOT, log_path, live_status=workers == 1, use_cache=not no_cache, stream=stream
+    )
+    scheduler = SectionScheduler(pipeline, PROJECT_ROOT / "logs" / "write-all-run.json", workers)
+    states = scheduler.run(
+        sorted(sections) or None,
+        fresh,
+        additional_context=additional_context,
+        start_from=start_from,
+        force=force,
+        concurrent=concurrent,
+    )
+
+    table = Table(title="Book Build", box=box.SIMPLE)
+    table.add_column("#", width=2)
+    table.add_column("State", width=8)
+    for number, state in sorted(states.items()):
+        table.add_row(str(number), state)
+    console.print(table)
+    if any(state != "done" for state in states.values()):
+        console.print("[yellow]Some sections did not finish. Re-run write-all to resume them.[/yellow]")
+        raise SystemExit(1)
+
+
+@cli.group()
+def batch():
+    """Run research or review for many sections as one discounted batch job."""
+    pass
+
+
+def _batch_runner() -> BatchRunner:
+    config = load_config()
+    ensure_log_dir(PROJECT_ROOT / "logs")
+    log_path = get_log_path(PROJECT_ROOT / "logs")
+    pipeline = Pipeline(config, PROJECT_ROOT, log_path, live_status=False)
+    return BatchRunner(pipeline, PROJECT_ROOT / "logs" / "batch-jobs")
+
+
+def _submit_batch(step: str, sections: tuple[int, ...], force: bool, wait: bool, poll_interval: float) -> None:
+    console = Console()
+    runner = _batch_runner()
+    job = runner.submit(step, sorted(sections) or None, force)
+    if job is None:
+        console.print(f"[green]No sections need {step}.[/green]")
+        return
+    console.print(f"[blue]Submitted {step} for {len(job['requests'])} sections as {job['name']}[/blue]")
+    if not wait:
+        console.print("[dim]Collect the results later with: bookforge batch collect[/dim]")
+        return
+    if not _finish_batch(console, runner, job, poll_interval):
+        raise SystemExit(1)
+
+
+def _finish_batch(console: Console, runner: BatchRunner, job: dict, poll_interval: float) -> bool:
+    """Wait for ``job`` and report it; False when any section came back without a result."""
+    console.print(f"[dim]Waiting for {job['name']} (checking every {poll_interval:g}s)...[/dim]")
+    runner.wait(job, poll_interval)
+    failed = [request["section"] for request in job["requests"] if "error" in request]
+    console.print(f"{job['name']} finished: {job['state']}")
+    if failed:
+        console.print(f"[yellow]Failed sections: {failed}. Re-submit them or run bookforge write --only.[/yellow]")
+    return not failed
+
+
+@batch.command(name="research")
+@click.argument("sections", type=int, nargs=-1)
+@click.option("--force", is_flag=True, help="Include sections whose research is up to date.")
+@click.option("--wait/--no-wait", default=True, show_default=True, help="Poll until the job finishes.")
+@click.option("--poll-interval", type=float, default=30.0, show_default=True, help="Seconds between status checks.")
+def batch_research(sections: tuple[int, ...], force: bool, wait: bool, poll_interval: float):
+    """Research all sections (or the given ones) in one batch job."""
+    _submit_batch("research", sections, force, wait, poll_interval)
+
+
+@batch.command(name="review")
+@click.argument("sections", type=int, nargs=-1)
+@click.option("--force", is_flag=True, help="Include sections whose review is up to date.")
+@click.option("--wait/--no-wait", default=True, show_default=True, help="Poll until the job finishes.")
+@click.option("--poll-interval", type=float, default=30.0, show_default=True, help="Seconds between status checks.")
+def batch_review(sections: tuple[int, ...], force: bool, wait: bool, poll_interval: float):
+    """Review every drafted section (or the given ones) in one batch job."""
+    _submit_batch("review", sections, force, wait, poll_interval)
+
+
+@batch.command(name="collect")
+@click.argument("job_name", required=False)
+@click.option("--wait/--no-wait", default=True, show_default=True, help="Poll until the jobs finish.")
+@click.option("--poll-interval", type=float, default=30.0, show_default=True, help="Seconds between status checks.")
+def batch_collect(job_name: str | None, wait: bool, poll_interval: float):
+    """Resume a submitted batch job (or every unfinished one) and save its results."""
+    console = Console()
+    runner = _batch_runner()
+    jobs = [runner.load(job_name)] if job_name else runner.pending_jobs()
+    jobs = [job for job in jobs if job["state"] not in TERMINAL_STATES]
+    if not jobs:
+        console.print("[green]No unfinished batch jobs.[/green]")
+        return
+    ok = True
+    for job in jobs:
+        if wait:
+            ok = _finish_batch(console, runner, job, poll_interval) and ok
+        elif runner.poll(job):
+            console.print(f"{job['name']} finished: {job['state']}")
+        else:
+            console.print(f"{job['name']}: {job['state']}")
+    if not ok:
+        raise SystemExit(1)
 
 
 @cli.command()
@@ -154,7 +302,7 @@ def approve(section_number: int):
 def status():
     """Display pipeline status for all sections."""
     console = Console()
-    tracker = StatusTracker(PROJECT_ROOT)
+    tracker = open_status_tracker(PROJECT_ROOT, configured_status_backend())
     cost_tracker = CostTracker(PROJECT_ROOT / "logs")
     data = tracker.get_all_statuses()
     toc = json.loads((PROJECT_ROOT / "config" / "toc.json").read_text(encoding="utf-8"))
@@ -195,7 +343,7 @@ def list():
     """Display build order with section details."""
     console = Console()
     toc = json.loads((PROJECT_ROOT / "config" / "toc.json").read_text(encoding="utf-8"))
-    tracker = StatusTracker(PROJECT_ROOT)
+    tracker = open_status_tracker(PROJECT_ROOT, configured_status_backend())
     statuses = tracker.get_all_statuses()
     table = Table(title="Build Order", box=box.SIMPLE)
     table.add_column("Order", width=5)
@@ -287,15 +435,23 @@ def export(format: str):
 
 
 @cli.command()
-def cost():
+@click.option(
+    "--by",
+    "group_by",
+    type=click.Choice(["section", "step", "model", "day"]),
+    default="section",
+    show_default=True,
+    help="Group costs by this field.",
+)
+def cost(group_by):
     """Display API costs per section and total."""
     console = Console()
     tracker = CostTracker(PROJECT_ROOT / "logs")
     table = Table(title="API Costs", box=box.SIMPLE)
-    table.add_column("Section", width=7)
+    table.add_column(group_by.capitalize(), width=7 if group_by == "section" else 28)
     table.add_column("Cost", width=10)
-    for row in tracker.get_cost_table():
-        table.add_row(str(row["section"]), f"${row['cost']:.2f}")
+    for row in tracker.get_cost_table(by=group_by):
+        table.add_row(str(row[group_by]), f"${row['cost']:.2f}")
     total = tracker.get_total_cost()
     console.print(table)
     console.print(f"Total cost: ${total:.2f}")
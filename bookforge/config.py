@@ -39,6 +39,22 @@ class Config:
     image_quality: str = "medium"
     image_background: str = "auto"
     image_format: str = "png"
+    api_timeout: float = 600.0
+    stream_output: bool = True
+    cache_enabled: bool = True
+    cache_max_mb: float = 500.0
+    cache_max_age_days: float = 30.0
+    writer_concurrency: int = 3
+    anthropic_rpm: int = 0
+    anthropic_tpm: int = 0
+    openai_rpm: int = 0
+    openai_tpm: int = 0
+    gemini_rpm: int = 0
+    gemini_tpm: int = 0
+    circuit_threshold: int = 5
+    circuit_cooldown: float = 60.0
+    # "json" or "sqlite"; empty means use whichever store already exists in chapters/.
+    status_backend: str = ""
 
     @property
     def output_path(self) -> Path:
@@ -91,9 +107,30 @@ def load_config() -> Config:
         image_quality=_get("IMAGE_QUALITY", "medium"),
         image_background=_get("IMAGE_BACKGROUND", "auto"),
         image_format=_get("IMAGE_FORMAT", "png"),
+        api_timeout=float(_get("API_TIMEOUT", "600")),
+        stream_output=_get("STREAM_OUTPUT", "true").lower() in {"1", "true", "yes", "on"},
+        cache_enabled=_get("CACHE_ENABLED", "true").lower() in {"1", "true", "yes", "on"},
+        cache_max_mb=float(_get("CACHE_MAX_MB", "500")),
+        cache_max_age_days=float(_get("CACHE_MAX_AGE_DAYS", "30")),
+        writer_concurrency=max(1, int(_get("WRITER_CONCURRENCY", "3"))),
+        anthropic_rpm=int(_get("ANTHROPIC_RPM", "0")),
+        anthropic_tpm=int(_get("ANTHROPIC_TPM", "0")),
+        openai_rpm=int(_get("OPENAI_RPM", "0")),
+        openai_tpm=int(_get("OPENAI_TPM", "0")),
+        gemini_rpm=int(_get("GEMINI_RPM", "0")),
+        gemini_tpm=int(_get("GEMINI_TPM", "0")),
+        circuit_threshold=max(1, int(_get("CIRCUIT_THRESHOLD", "5"))),
+        circuit_cooldown=float(_get("CIRCUIT_COOLDOWN", "60")),
+        status_backend=_get("STATUS_BACKEND").lower(),
     )
 
 
+def configured_status_backend() -> str:
+    """``STATUS_BACKEND`` from .env or the environment, for commands that run without API keys."""
+    load_dotenv(Path(__file__).resolve().parent / ".env", override=True)
+    return (os.getenv("STATUS_BACKEND") or "").strip().lower()
+
+
 def get_log_path(logs_dir: Path) -> Path:
     date_stamp = datetime.utcnow().strftime("%Y-%m-%d")
     return logs_dir / f"bookforge-{date_stamp}.log"
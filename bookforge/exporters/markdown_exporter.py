@@ -9,6 +9,17 @@ from rich.console import Console
 PIPELINE_VERSION = "2.0"
 
 
+def strip_front_matter(text: str | None) -> str:
+    """The body of a file written by ``save_file``, without the front matter block."""
+    if not text:
+        return ""
+    if text.startswith("---"):
+        parts = text.split("---", 2)
+        if len(parts) == 3:
+            return parts[2].lstrip()
+    return text
+
+
 class MarkdownExporter:
     def __init__(self, base_dir: Path):
         self.base_dir = base_dir
@@ -0,0 +1,174 @@
+"""Run research or review for many sections as one Gemini batch job.
+
+Neither step needs an interactive answer, so ``bookforge batch`` collects the
+prompts of every section that is out of date, submits them together at the
+batch price, and records the job in ``logs/batch-jobs/<job>.json``. Polling can
+stop and resume (``bookforge batch collect``) because everything needed to
+finish is in that file: which section each request belongs to and the input
+fingerprint it was built from. Finished results are written to the same
+``research/`` and ``reports/`` files, manifest and status as a normal run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from agents.batcher import TERMINAL_STATES
+from agents.researcher import Researcher
+from agents.reviewer import Reviewer
+from exporters.markdown_exporter import strip_front_matter
+from prompts.reviewer import REVIEWER_PROMPT
+
+# Batch step: pipeline step number, output subfolder and file, saved prompt file.
+BATCH_STEPS = {
+    "research": (0, "research", "research.md", "research-prompt.md"),
+    "review": (4, "reports", "review-report.md", "review-prompt.md"),
+}
+
+
+class BatchRunner:
+    def __init__(self, pipeline, jobs_dir: Path):
+        self.pipeline = pipeline
+        self.jobs_dir = jobs_dir
+        self.console = pipeline.console
+
+    def _job_path(self, name: str) -> Path:
+        return self.jobs_dir / f"{name.rsplit('/', 1)[-1]}.json"
+
+    def _save(self, job: dict) -> None:
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        path = self._job_path(job["name"])
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(job, indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def load(self, name: str) -> dict:
+        path = self._job_path(name)
+        if not path.exists():
+            raise FileNotFoundError(f"No batch job record at {path}")
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def pending_jobs(self) -> list[dict]:
+        if not self.jobs_dir.exists():
+            return []
+        jobs = [json.loads(path.read_text(encoding="utf-8")) for path in sorted(self.jobs_dir.glob("*.json"))]
+        return [job for job in jobs if job["state"] not in TERMINAL_STATES]
+
+    def _sections(self, numbers: list[int] | None) -> list[dict]:
+        toc = json.loads(self.pipeline.toc_path.read_text(encoding="utf-8"))
+        if numbers:
+            return [self.pipeline.get_section(number) for number in numbers]
+        return sorted(toc["sections"], key=lambda s: s["build_order"])
+
+    def collect(self, step: str, numbers: list[int] | None = None, force: bool = False) -> list[dict]:
+        """Build a request for every section whose ``step`` output is missing or out of date."""
+        step_number, subfolder, filename, prompt_name = BATCH_STEPS[step]
+        pipeline = self.pipeline
+        toc = json.loads(pipeline.toc_path.read_text(encoding="utf-8"))
+        deep_sections = set(toc["research_strategy"]["deep_research_sections"])
+        in_flight = {
+            request["section"]
+            for job in self.pending_jobs()
+            if job["step"] == step
+            for request in job["requests"]
+        }
+
+        requests = []
+        for section in self._sections(numbers):
+            number = section["number"]
+            chapter_dir = pipeline.get_chapter_dir(section)
+            output_path = chapter_dir / subfolder / filename
+            if number in in_flight:
+                self.console.print(f"[yellow] Section {number}: {step} already in a pending batch job[/yellow]")
+                continue
+            if step == "review" and not (chapter_dir / "drafts" / "draft-1-claude.md").exists():
+                self.console.print(f"[yellow] Section {number}: no draft to review; skipping[/yellow]")
+                continue
+            pipeline.ensure_chapter_dirs(section)
+            inputs = pipeline.step_inputs(step_number, section, chapter_dir)
+            if step == "research" and number in deep_sections and output_path.exists() and not force:
+                self.console.print(f"[green] Section {number}: using existing Deep Research file[/green]")
+                continue
+            if pipeline.skip_or_run(output_path, force, inputs):
+                self.console.print(f"[yellow] Section {number}: skipping {step} (up to date)[/yellow]")
+                continue
+
+            if step == "research":
+                system, prompt = "", Researcher.build_prompt(section)
+                saved_prompt = prompt
+            else:
+                draft = strip_front_matter(pipeline.exporter.load_file(chapter_dir, "drafts", "draft-1-claude.md"))
+                system, prompt = REVIEWER_PROMPT, Reviewer.build_prompt(draft)
+                saved_prompt = f"{system}\n\n{prompt}"
+            pipeline.exporter.save_prompt(chapter_dir, prompt_name, saved_prompt)
+            requests.append(
+                {"key": f"{step}-{number}", "section": number, "system": system, "prompt": prompt, "inputs": inputs}
+            )
+        return requests
+
+    def submit(self, step: str, numbers: list[int] | None = None, force: bool = False) -> dict | None:
+        """Submit one batch job for ``step`` and persist its record; None when nothing is out of date."""
+        requests = self.collect(step, numbers, force)
+        if not requests:
+            return None
+        model = self.pipeline.config.gemini_model
+        name = self.pipeline.batcher.submit(model, step, requests)
+        job = {
+            "name": name,
+            "step": step,
+            "model": model,
+            "state": "JOB_STATE_PENDING",
+            "submitted": datetime.utcnow().isoformat(),
+            "requests": [
+                {"key": request["key"], "section": request["section"], "inputs": request["inputs"]}
+                for request in requests
+            ],
+        }
+        self._save(job)
+        for request in requests:
+            self.pipeline.status.start_step(request["section"], BATCH_STEPS[step][0])
+        return job
+
+    def poll(self, job: dict) -> bool:
+        """Check the job once, writing results if it has finished. True when it is done."""
+        state, results = self.pipeline.batcher.poll(job["name"])
+        job["state"] = state
+        job["checked"] = datetime.utcnow().isoformat()
+        done = state in TERMINAL_STATES
+        if done:
+            self._apply(job, results)
+            job["finished"] = job["checked"]
+        self._save(job)
+        return done
+
+    def wait(self, job: dict, poll_interval: float = 30.0) -> dict:
+        while not self.poll(job):
+            time.sleep(poll_interval)
+        return job
+
+    def _apply(self, job: dict, results: dict[str, dict]) -> None:
+        step = job["step"]
+        step_number, subfolder, filename, _ = BATCH_STEPS[step]
+        pipeline = self.pipeline
+        for request in job["requests"]:
+            number = request["section"]
+            result = results.get(request["key"]) or {"error": f"job ended {job['state']} without a result"}
+            if "error" in result:
+                request["error"] = result["error"]
+                pipeline.batcher.record_failure(job["model"], step, number, result["error"])
+                self.console.print(f"[red] Section {number}: {step} failed in batch: {result['error']}[/red]")
+                continue
+            section = pipeline.get_section(number)
+            chapter_dir = pipeline.get_chapter_dir(section)
+            text = pipeline.batcher.record_result(job["model"], step, number, result["response"])
+            output_path = pipeline.exporter.save_file(chapter_dir, subfolder, filename, text, section, step)
+            # The input hashes from submission time: if inputs changed while the job ran,
+            # the next run sees the mismatch and redoes the step.
+            pipeline.record_inputs(output_path, request["inputs"])
+            pipeline.status.update_step(number, step_number, section)
+            request["written"] = output_path.relative_to(pipeline.project_root).as_posix()
+            self.console.print(f"[green] Section {number}: {step} saved to {request['written']}[/green]")
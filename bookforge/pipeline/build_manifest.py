@@ -0,0 +1,76 @@
+"""Per-chapter record of the inputs each step's output was built from.
+
+Each chapter folder has a ``.manifest.json`` mapping an output file (relative to
+the chapter folder) to a fingerprint of everything that went into it: upstream
+artifacts, the prompt template, the model and relevant settings. A step is
+skipped only while its output exists and its current inputs hash to the recorded
+fingerprint, so editing research, human notes or a prompt re-runs exactly the
+steps downstream of the change. Each input's own hash is kept next to the
+fingerprint, so a re-run can say which inputs changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_NAME = ".manifest.json"
+# Recorded in place of a fingerprint for output salvaged from an interrupted run;
+# it matches no inputs, so the next run rebuilds that output.
+SALVAGED = "salvaged"
+
+_LOCK = threading.Lock()
+
+
+def fingerprint(**inputs) -> str:
+    """Stable hash of keyword inputs (strings, numbers, dicts and lists)."""
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def input_hashes(**inputs) -> dict[str, str]:
+    """Hash each keyword input separately, so changed inputs can be named."""
+    return {name: fingerprint(value=value) for name, value in inputs.items()}
+
+
+def changed_inputs(recorded: dict[str, str], current: dict[str, str]) -> list[str]:
+    return sorted(name for name in recorded.keys() | current.keys() if recorded.get(name) != current.get(name))
+
+
+class BuildManifest:
+    def __init__(self, chapter_dir: Path):
+        self.chapter_dir = chapter_dir
+        self.path = chapter_dir / MANIFEST_NAME
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except ValueError:
+            return {}  # a damaged manifest only costs a rebuild
+
+    def _key(self, output_path: Path) -> str:
+        return output_path.relative_to(self.chapter_dir).as_posix()
+
+    def recorded(self, output_path: Path) -> dict | None:
+        """The entry for ``output_path``: its ``inputs`` fingerprint and, when known, the per-input ``parts``."""
+        return self._load().get(self._key(output_path))
+
+    def record(self, output_path: Path, inputs: dict[str, str] | str) -> None:
+        """Record per-input hashes (see ``input_hashes``), or a bare marker such as ``SALVAGED``."""
+        entry = {"recorded": datetime.utcnow().isoformat()}
+        if isinstance(inputs, dict):
+            entry.update(inputs=fingerprint(**inputs), parts=inputs)
+        else:
+            entry["inputs"] = inputs
+        with _LOCK:
+            data = self._load()
+            data[self._key(output_path)] = entry
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+            tmp_path.replace(self.path)
@@ -1,10 +1,29 @@
+"""API cost ledger.
+
+Every call is one JSON line appended to ``logs/costs.jsonl`` and fsync'd under
+a cross-process lock, so a crash loses at most the line being written and
+parallel runs cannot clobber each other. A ``costs.json`` from older versions
+is migrated into the ledger once and renamed to ``costs.json.migrated``.
+
+Totals per section, step, model and day are kept in ``logs/costs.index.json``
+together with the ledger byte offset they cover. Reports load the index and
+fold in only the lines appended since, instead of rescanning the whole ledger.
+The index also records which ledger it was built from (inode and a hash of the
+first line); if ``costs.jsonl`` is replaced by another file, even a longer one,
+the index is rebuilt. It can always be deleted; it is rebuilt on next use.
+"""
+
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 from datetime import datetime
 import warnings
 from pathlib import Path
 
+from pipeline.file_lock import locked
+
 
 class CostTracker:
     PRICES = {
@@ -13,18 +32,58 @@ class CostTracker:
         "gemini": {"input": 0.075 / 1_000_000, "output": 0.30 / 1_000_000},
         "unknown": {"input": 0.0, "output": 0.0},
     }
+    # Anthropic prompt caching, relative to the input price: writing a prefix to the
+    # cache costs 25% more than plain input, reading it back costs 10%.
+    CACHE_WRITE_MULTIPLIER = 1.25
+    CACHE_READ_MULTIPLIER = 0.1
+    # Batch API jobs are billed at half the interactive price.
+    BATCH_MULTIPLIER = 0.5
 
     def __init__(self, logs_dir: Path):
-        self.costs_path = logs_dir / "costs.json"
-        self.costs_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ledger_path = logs_dir / "costs.jsonl"
+        self.legacy_path = logs_dir / "costs.json"
+        self.lock_path = logs_dir / "costs.jsonl.lock"
+        self.index_path = logs_dir / "costs.index.json"
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        self._migrate_legacy()
+        self._index: dict | None = None
 
-    def _load(self) -> list:
-        if not self.costs_path.exists():
-            return []
-        return json.loads(self.costs_path.read_text(encoding="utf-8"))
+    def _migrate_legacy(self) -> None:
+        if not self.legacy_path.exists():
+            return
+        with locked(self.lock_path):
+            if not self.legacy_path.exists():
+                return  # another process finished the migration first
+            if not self.ledger_path.exists():
+                entries = json.loads(self.legacy_path.read_text(encoding="utf-8") or "[]")
+                tmp_path = self.ledger_path.with_suffix(".jsonl.tmp")
+                with tmp_path.open("w", encoding="utf-8") as handle:
+                    for entry in entries:
+                        handle.write(json.dumps(entry) + "\n")
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                tmp_path.replace(self.ledger_path)
+            # If the ledger already exists, an earlier migration was interrupted after
+            # writing it; only the rename is left to do.
+            self.legacy_path.replace(self.legacy_path.with_name("costs.json.migrated"))
 
-    def _save(self, data: list) -> None:
-        self.costs_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    def _append(self, entry: dict) -> None:
+        """Append one ledger line. Call with the ledger lock held."""
+        line = json.dumps(entry) + "\n"
+        if self._ends_torn():
+            line = "\n" + line  # keep a crash's partial line from swallowing this one
+        with self.ledger_path.open("a", encoding="utf-8") as handle:
+            handle.write(line)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _ends_torn(self) -> bool:
+        try:
+            with self.ledger_path.open("rb") as handle:
+                handle.seek(-1, os.SEEK_END)
+                return handle.read(1) != b"\n"
+        except OSError:
+            return False  # missing or empty ledger
 
     def _price_key(self, model: str) -> str:
         model_lower = model.lower()
@@ -37,10 +96,38 @@ class CostTracker:
         warnings.warn(f"Unknown model for pricing: {model}. Cost will be recorded as $0.", RuntimeWarning)
         return "unknown"
 
-    def log_api_call(self, model: str, input_tokens: int, output_tokens: int, section_number: int, step_name: str) -> float:
-        key = self._price_key(model)
-        prices = self.PRICES[key]
-        cost = input_tokens * prices["input"] + output_tokens * prices["output"]
+    def log_api_call(
+        self,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        section_number: int,
+        step_name: str,
+        cached: bool = False,
+        cache_write_tokens: int = 0,
+        cache_read_tokens: int = 0,
+        batch: bool = False,
+    ) -> float:
+        """Record one call and return its cost.
+
+        ``input_tokens`` are the uncached prompt tokens; prompt-cache writes and reads
+        are passed separately and priced with the cache multipliers. ``batch`` marks a
+        result delivered by a batch job, priced with ``BATCH_MULTIPLIER``.
+        """
+        if cached:
+            # Served from the local response cache: nothing was billed.
+            cost = 0.0
+        else:
+            key = self._price_key(model)
+            prices = self.PRICES[key]
+            cost = (
+                input_tokens * prices["input"]
+                + cache_write_tokens * prices["input"] * self.CACHE_WRITE_MULTIPLIER
+                + cache_read_tokens * prices["input"] * self.CACHE_READ_MULTIPLIER
+                + output_tokens * prices["output"]
+            )
+            if batch:
+                cost *= self.BATCH_MULTIPLIER
         entry = {
             "timestamp": datetime.utcnow().isoformat(),
             "model": model,
@@ -50,24 +137,111 @@ class CostTracker:
             "output_tokens": output_tokens,
             "cost": round(cost, 6),
         }
-        data = self._load()
-        data.append(entry)
-        self._save(data)
+        if cache_write_tokens or cache_read_tokens:
+            entry["cache_write_tokens"] = cache_write_tokens
+            entry["cache_read_tokens"] = cache_read_tokens
+        if cached:
+            entry["cached"] = True
+        if batch:
+            entry["batch"] = True
+        with locked(self.lock_path):
+            self._append(entry)
+            # Folds this entry and anything other processes appended since the last read.
+            self._catch_up()
+            self._save_index()
         return cost
 
+    @staticmethod
+    def _empty_index() -> dict:
+        return {
+            "ledger": None, "offset": 0, "total": 0.0, "calls": 0, "section": {}, "step": {}, "model": {}, "day": {},
+        }
+
+    @staticmethod
+    def _fold(index: dict, entry: dict) -> None:
+        cost = entry.get("cost", 0.0)
+        index["total"] += cost
+        index["calls"] += 1
+        keys = {
+            "section": str(entry.get("section")),
+            "step": str(entry.get("step")),
+            "model": str(entry.get("model")),
+            "day": str(entry.get("timestamp", ""))[:10],
+        }
+        for dimension, key in keys.items():
+            index[dimension][key] = index[dimension].get(key, 0.0) + cost
+
+    def _load_index(self) -> dict:
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if set(self._empty_index()) <= set(index):
+                return index
+        except (OSError, ValueError):
+            pass
+        return self._empty_index()
+
+    def _catch_up(self) -> bool:
+        """Fold ledger lines past the index offset into the index. Call with the ledger lock held."""
+        if self._index is None:
+            self._index = self._load_index()
+        index = self._index
+        size = self.ledger_path.stat().st_size if self.ledger_path.exists() else 0
+        identity = self._ledger_identity()
+        if size < index["offset"] or index["ledger"] != identity:
+            # The ledger was replaced or truncated; start over.
+            index.clear()
+            index.update(self._empty_index())
+            index["ledger"] = identity
+        if size == index["offset"]:
+            return False
+        with self.ledger_path.open("rb") as handle:
+            handle.seek(index["offset"])
+            for raw in handle:
+                if not raw.endswith(b"\n"):
+                    break  # an append still in progress; pick it up next time
+                index["offset"] += len(raw)
+                try:
+                    self._fold(index, json.loads(raw))
+                except ValueError:
+                    continue
+        return True
+
+    def _ledger_identity(self) -> dict:
+        """Inode and first-line hash of the ledger; they change when the file is swapped out."""
+        try:
+            with self.ledger_path.open("rb") as handle:
+                inode = os.fstat(handle.fileno()).st_ino
+                first = handle.readline()
+        except OSError:
+            return {"inode": None, "head": ""}
+        if not first.endswith(b"\n"):
+            first = b""  # the first append is still in progress
+        return {"inode": inode, "head": hashlib.sha256(first).hexdigest() if first else ""}
+
+    def _save_index(self) -> None:
+        tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._index), encoding="utf-8")
+        tmp_path.replace(self.index_path)
+
+    def _aggregates(self) -> dict:
+        with locked(self.lock_path):
+            if self._catch_up():
+                self._save_index()
+            return self._index
+
     def get_section_cost(self, section_number: int) -> float:
-        data = self._load()
-        return sum(entry["cost"] for entry in data if entry["section"] == section_number)
+        return self._aggregates()["section"].get(str(section_number), 0.0)
 
     def get_total_cost(self) -> float:
-        data = self._load()
-        return sum(entry["cost"] for entry in data)
-
-    def get_cost_table(self) -> list[dict]:
-        data = self._load()
-        by_section = {}
-        for entry in data:
-            sec = entry["section"]
-            by_section.setdefault(sec, 0.0)
-            by_section[sec] += entry["cost"]
-        return [{"section": sec, "cost": round(cost, 2)} for sec, cost in sorted(by_section.items())]
+        return self._aggregates()["total"]
+
+    def get_cost_table(self, by: str = "section") -> list[dict]:
+        """Costs grouped by ``section``, ``step``, ``model`` or ``day``."""
+        if by not in ("section", "step", "model", "day"):
+            raise ValueError(f"Unknown cost grouping: {by}")
+        totals = self._aggregates()[by]
+        if by == "section":
+            items = sorted(((int(key), cost) for key, cost in totals.items() if key.lstrip("-").isdigit()))
+        else:
+            items = sorted(totals.items())
+        return [{by: key, "cost": round(cost, 2)} for key, cost in items]
@@ -0,0 +1,130 @@
+"""Streaming text reader for .docx files.
+
+Reads the WordprocessingML parts straight out of the zip with ``iterparse``,
+detaching each element from its parent once its text is collected, so memory
+stays bounded by the deepest open element path rather than the whole document
+tree. Besides the body paragraphs that python-docx's ``Document.paragraphs``
+exposes, it reads table cells, text boxes, footnotes, endnotes and headers.
+Every item carries its location, e.g. ``"table 2, row 3, cell 1"``,
+``"text box 1"`` or ``"footnote 4"``.
+"""
+
+from __future__ import annotations
+
+import re
+import zipfile
+from pathlib import Path
+from typing import IO, Iterator
+from xml.etree.ElementTree import iterparse
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_P, _T, _TBL, _TR, _TC = f"{_W}p", f"{_W}t", f"{_W}tbl", f"{_W}tr", f"{_W}tc"
+_TEXT_BOX = f"{_W}txbxContent"
+# Legacy copy of the content in an mc:AlternateContent choice, e.g. a text box as VML.
+_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_NOTES = {f"{_W}footnote": "footnote", f"{_W}endnote": "endnote"}
+# Run content that python-docx renders as characters.
+_CHARACTERS = {f"{_W}tab": "\t", f"{_W}ptab": "\t", f"{_W}br": "\n", f"{_W}cr": "\n", f"{_W}noBreakHyphen": "-"}
+_ID = f"{_W}id"
+_TYPE = f"{_W}type"
+
+
+def _read_part(stream: IO[bytes], part: str) -> Iterator[tuple[str, str]]:
+    """Yield ``(text, location)`` for the paragraphs and table cells of one XML part."""
+    # Text of each open paragraph; a text box puts whole paragraphs inside a run of another.
+    paragraphs: list[list[str]] = []
+    # Ancestors of the current element, so each finished element can be detached.
+    open_elements = []
+    body_paragraphs = 0
+    tables = 0
+    text_boxes = 0
+    fallback = 0
+    # One entry per open table: [table number, row, cell, text of the current cell].
+    open_tables: list[list] = []
+    note: str | None = None
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            open_elements.append(elem)
+            if tag == _FALLBACK:
+                fallback += 1
+            elif fallback:
+                pass
+            elif tag == _P:
+                paragraphs.append([])
+            elif tag == _TEXT_BOX:
+                text_boxes += 1
+            elif tag == _TBL:
+                tables += 1
+                open_tables.append([tables, 0, 0, []])
+            elif tag == _TR:
+                open_tables[-1][1] += 1
+                open_tables[-1][2] = 0
+            elif tag == _TC:
+                open_tables[-1][2] += 1
+                open_tables[-1][3] = []
+            elif tag in _NOTES:
+                # Separator "notes" hold no text of their own.
+                note = None if elem.get(_TYPE) else f"{_NOTES[tag]} {elem.get(_ID)}"
+            continue
+
+        open_elements.pop()
+        if open_elements:
+            # Everything this element holds has been read; drop it from the tree.
+            open_elements[-1].remove(elem)
+        if tag == _FALLBACK:
+            fallback -= 1
+        elif fallback:
+            pass
+        elif tag == _T and paragraphs:
+            paragraphs[-1].append(elem.text or "")
+        elif tag in _CHARACTERS and paragraphs:
+            paragraphs[-1].append(_CHARACTERS[tag])
+        elif tag == _P:
+            text = "".join(paragraphs.pop()).strip()
+            if not text:
+                continue
+            if paragraphs:
+                yield text, f"text box {text_boxes}" if part == "document" else f"{part}, text box {text_boxes}"
+            elif open_tables:
+                open_tables[-1][3].append(text)
+            elif note is not None:
+                yield text, note
+            elif part == "document":
+                body_paragraphs += 1
+                yield text, f"paragraph {body_paragraphs}"
+            else:
+                yield text, part
+        elif tag == _TC:
+            number, row, cell, texts = open_tables[-1]
+            if texts:
+                text = "\n".join(texts)
+                if len(open_tables) > 1:
+                    # A nested table reads as part of its enclosing cell.
+                    open_tables[-2][3].append(text)
+                else:
+                    yield text, f"table {number}, row {row}, cell {cell}"
+        elif tag == _TBL:
+            open_tables.pop()
+        elif tag in _NOTES:
+            note = None
+
+
+def _header_parts(names: list[str]) -> list[str]:
+    headers = [name for name in names if re.fullmatch(r"word/header\d*\.xml", name)]
+    return sorted(headers, key=lambda name: int(re.sub(r"\D", "", name) or 0))
+
+
+def iter_docx(path: Path) -> Iterator[tuple[str, str]]:
+    """Yield ``(text, location)`` for every text block in a .docx, body first.
+
+    Raises ``zipfile.BadZipFile`` or ``KeyError`` if ``path`` is not a Word document.
+    """
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+        parts = [("word/document.xml", "document")]
+        parts += [(name, Path(name).stem) for name in _header_parts(names)]
+        parts += [(name, Path(name).stem) for name in ("word/footnotes.xml", "word/endnotes.xml") if name in names]
+        for name, part in parts:
+            with archive.open(name) as stream:
+                yield from _read_part(stream, part)
@@ -2,24 +2,66 @@ from __future__ import annotations
 
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.status import Status
 
-from agents.writer import Writer
+from agents.writer import (
+    DRAFT_REMINDERS,
+    REVISION_CLOSING,
+    REVISION_INSTRUCTIONS,
+    SUBSECTION_REVISION_INSTRUCTIONS,
+    Writer,
+    partial_prompt_path,
+)
 from agents.expander import Expander
 from agents.checker import Checker
 from agents.reviewer import Reviewer
 from agents.researcher import Researcher
+from agents.batcher import Batcher
 from agents.readability import ReadabilityAnalyzer
 from agents.graphic_prompter import GraphicPrompter
 from agents.image_generator import ImageGenerator
-from exporters.markdown_exporter import MarkdownExporter
-from pipeline.status_tracker import StatusTracker
+from agents.clients import ClientRegistry
+from exporters.markdown_exporter import MarkdownExporter, strip_front_matter
+from pipeline.status_tracker import open_status_tracker
 from pipeline.cost_tracker import CostTracker
 from pipeline.source_loader import SourceLoader
+from pipeline.response_cache import ResponseCache
+from pipeline.build_manifest import SALVAGED, BuildManifest, changed_inputs, input_hashes
+from prompts.checker import CHECKER_PROMPT
+from prompts.expander import EXPANDER_PROMPT
+from prompts.master_writer import MASTER_WRITER_PROMPT
+from prompts.researcher import RESEARCHER_PROMPT
+from prompts.reviewer import REVIEWER_PROMPT
+
+# Per step: upstream artifacts (subfolder, file), the config field naming its model,
+# and its prompt template plus any prompt text the agent adds inline. Together with
+# the section entry these decide whether a step's existing output is still up to date.
+_STEP_INPUTS = {
+    0: ((), "gemini_model", RESEARCHER_PROMPT),
+    1: ((("research", "research.md"),), "claude_model", (MASTER_WRITER_PROMPT, DRAFT_REMINDERS)),
+    2: ((("drafts", "draft-1-claude.md"),), "openai_model", EXPANDER_PROMPT),
+    3: ((("drafts", "draft-1-claude.md"), ("drafts", "expansion-notes.md")), "openai_model", CHECKER_PROMPT),
+    4: ((("drafts", "draft-1-claude.md"),), "gemini_model", REVIEWER_PROMPT),
+    5: (
+        (
+            ("drafts", "draft-1-claude.md"),
+            ("drafts", "expansion-notes.md"),
+            ("reports", "fact-check-report.md"),
+            ("reports", "review-report.md"),
+            ("reports", "human-notes.md"),
+        ),
+        "claude_model",
+        (MASTER_WRITER_PROMPT, REVISION_INSTRUCTIONS, REVISION_CLOSING, SUBSECTION_REVISION_INSTRUCTIONS),
+    ),
+    6: ((("drafts", "draft-2-revised.md"),), None, ""),
+    8: ((("final", None), ("drafts", "draft-2-revised.md")), "image_model", ""),
+}
 
 
 def _slugify(text: str) -> str:
@@ -27,32 +69,45 @@ def _slugify(text: str) -> str:
     return slug or "section"
 
 
-def _strip_front_matter(text: str | None) -> str:
-    if not text:
-        return ""
-    if text.startswith("---"):
-        parts = text.split("---", 2)
-        if len(parts) == 3:
-            return parts[2].lstrip()
-    return text
-
-
 class Pipeline:
-    def __init__(self, config, project_root: Path, log_path: Path):
+    def __init__(
+        self,
+        config,
+        project_root: Path,
+        log_path: Path,
+        live_status: bool = True,
+        use_cache: bool = True,
+        stream: bool | None = None,
+    ):
         self.config = config
         self.project_root = project_root
         self.console = Console()
+        # Rich allows one live display per console; multi-section runs print plain lines instead.
+        self.live_status = live_status
+        # Stream long Claude outputs (draft, revision) into .partial files as they arrive.
+        self.stream = config.stream_output if stream is None else stream
         self.exporter = MarkdownExporter(project_root)
-        self.status = StatusTracker(project_root)
+        self.status = open_status_tracker(project_root, config.status_backend)
         self.cost = CostTracker(project_root / "logs")
-        self.writer = Writer(config, self.exporter, self.cost, log_path)
-        self.expander = Expander(config, self.exporter, self.cost, log_path)
-        self.checker = Checker(config, self.exporter, self.cost, log_path)
-        self.reviewer = Reviewer(config, self.exporter, self.cost, log_path)
-        self.researcher = Researcher(config, self.exporter, self.cost, log_path)
+        # One set of SDK clients per pipeline keeps connections warm across steps and sections.
+        self.clients = ClientRegistry(config)
+        self.cache = None
+        if config.cache_enabled:
+            self.cache = ResponseCache(
+                project_root / ".cache" / "responses",
+                max_bytes=int(config.cache_max_mb * 1024 * 1024),
+                max_age_days=config.cache_max_age_days,
+                bypass=not use_cache,
+            )
+        self.writer = Writer(config, self.exporter, self.cost, log_path, self.clients, self.cache)
+        self.expander = Expander(config, self.exporter, self.cost, log_path, self.clients, self.cache)
+        self.checker = Checker(config, self.exporter, self.cost, log_path, self.clients, self.cache)
+        self.reviewer = Reviewer(config, self.exporter, self.cost, log_path, self.clients, self.cache)
+        self.researcher = Researcher(config, self.exporter, self.cost, log_path, self.clients, self.cache)
+        self.batcher = Batcher(config, self.exporter, self.cost, log_path, self.clients)
         self.readability = ReadabilityAnalyzer()
         self.graphic_prompter = GraphicPrompter()
-        self.image_generator = ImageGenerator(config, self.exporter, self.cost, log_path)
+        self.image_generator = ImageGenerator(config, self.exporter, self.cost, log_path, self.clients)
         self.source_loader = SourceLoader(project_root)
         self.toc_path = project_root / "config" / "toc.json"
 
@@ -79,8 +134,91 @@ class Pipeline:
         )
         return Panel(body, title="BOOKFORGE v2  Pipeline", style="blue")
 
-    def _skip_or_run(self, path: Path, force: bool) -> bool:
-        return path.exists() and not force
+    def _status(self, message: str):
+        if self.live_status:
+            return Status(message, console=self.console)
+        self.console.print(f"[dim]{message}[/dim]")
+        return nullcontext()
+
+    def _progress(self, status, message: str):
+        if status is None:
+            return None
+        return lambda words: status.update(f"{message} {words:,} words")
+
+    def _partial_path(self, output_path: Path) -> Path | None:
+        return output_path.with_name(output_path.name + ".partial") if self.stream else None
+
+    def _discard_partial(self, output_path: Path) -> None:
+        """Delete the leftover ``.partial`` of an interrupted run and its prompt hash."""
+        partial_path = output_path.with_name(output_path.name + ".partial")
+        partial_path.unlink(missing_ok=True)
+        partial_prompt_path(partial_path).unlink(missing_ok=True)
+
+    def _salvage_partial(self, output_path: Path, label: str) -> str | None:
+        """Take the text of an interrupted streaming run as the step output, if there is any.
+
+        Salvaged output is recorded as ``SALVAGED`` rather than with its inputs'
+        fingerprint, so the next run without ``--salvage`` produces it properly.
+        """
+        partial_path = output_path.with_name(output_path.name + ".partial")
+        if not partial_path.exists():
+            return None
+        text = partial_path.read_text(encoding="utf-8").strip()
+        if not text:
+            return None
+        self._discard_partial(output_path)
+        self.console.print(
+            f"[yellow] Salvaged partial {label} ({len(text.split())} words). It may end mid-sentence.[/yellow]"
+        )
+        return text
+
+    def step_inputs(self, step_number: int, section: dict, chapter_dir: Path, **extra) -> dict[str, str]:
+        """Hash of each input step ``step_number`` reads; ``extra`` adds or overrides inputs.
+
+        Upstream artifacts are hashed one by one under their ``subfolder/file`` name.
+        """
+        artifacts, model_field, template = _STEP_INPUTS[step_number]
+        upstream = {}
+        for subfolder, filename in artifacts:
+            filename = filename or f"{section['number']:02d}-{section['slug']}.md"
+            # Front matter carries a generation timestamp; only the content matters.
+            upstream[f"{subfolder}/{filename}"] = strip_front_matter(
+                self.exporter.load_file(chapter_dir, subfolder, filename)
+            )
+        upstream.update(extra.pop("upstream", {}))
+        return input_hashes(
+            step=step_number,
+            section=section,
+            model=getattr(self.config, model_field) if model_field else "",
+            template=template,
+            **upstream,
+            **extra,
+        )
+
+    def skip_or_run(self, path: Path, force: bool, inputs: dict[str, str] | None = None) -> bool:
+        """True when ``path`` can be reused: it exists and, given ``inputs``, they are unchanged."""
+        if force or not path.exists():
+            return False
+        if inputs is None:
+            return True
+        manifest = BuildManifest(path.parents[1])
+        entry = manifest.recorded(path)
+        if entry is not None and entry.get("inputs") == SALVAGED:
+            self.console.print(f"[yellow] {path.name} was salvaged from an interrupted run; re-running[/yellow]")
+            return False
+        if entry is None or "parts" not in entry:
+            # Output from before manifests, or before they kept per-input hashes:
+            # adopt it rather than rebuild everything.
+            manifest.record(path, inputs)
+            return True
+        changed = changed_inputs(entry["parts"], inputs)
+        if changed:
+            self.console.print(f"[yellow] Inputs changed for {path.name} ({', '.join(changed)}); re-running[/yellow]")
+            return False
+        return True
+
+    def record_inputs(self, path: Path, inputs: dict[str, str] | str) -> None:
+        BuildManifest(path.parents[1]).record(path, inputs)
 
     def _should_run(self, step_number: int, start_from: int, only_step: int | None) -> bool:
         if only_step is not None:
@@ -91,6 +229,72 @@ class Pipeline:
         if not path.exists():
             raise FileNotFoundError(message)
 
+    def _run_feedback_concurrently(self, section: dict, chapter_dir: Path, start_from: int, force: bool) -> None:
+        """Run steps 2-4 (expand, fact-check, review) in parallel against the same draft.
+
+        Each step talks to a different provider, so the wall-clock time is the slowest
+        call rather than the sum. When the expansion is regenerated in the same batch,
+        the fact-check runs against the draft alone instead of waiting for it.
+        """
+        section_number = section["number"]
+        steps = {
+            2: ("expansion", "drafts", "expansion-notes.md", "expand"),
+            3: ("fact-check", "reports", "fact-check-report.md", "fact_check"),
+            4: ("review", "reports", "review-report.md", "review"),
+        }
+        pending = []
+        inputs = {}
+        for step_number, (label, subfolder, filename, _) in steps.items():
+            if not self._should_run(step_number, start_from, None):
+                continue
+            inputs[step_number] = self.step_inputs(step_number, section, chapter_dir)
+            if self.skip_or_run(chapter_dir / subfolder / filename, force, inputs[step_number]):
+                self.console.print(f"[yellow] Skipping {label} (up to date)[/yellow]")
+                continue
+            pending.append(step_number)
+        if not pending:
+            return
+
+        self._require_file(
+            chapter_dir / "drafts" / "draft-1-claude.md",
+            f"Missing draft for steps 2-4. Run: bookforge write {section_number} --only 1",
+        )
+        draft = strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-1-claude.md"))
+        if 2 in pending:
+            expansion = ""
+            if 3 in pending:
+                inputs[3] = self.step_inputs(3, section, chapter_dir, upstream={"drafts/expansion-notes.md": ""})
+        else:
+            expansion = strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "expansion-notes.md"))
+
+        jobs = {
+            2: lambda: self.expander.expand_section(section, draft, chapter_dir),
+            3: lambda: self.checker.check_section(section, draft, expansion, chapter_dir),
+            4: lambda: self.reviewer.review_section(section, draft, chapter_dir),
+        }
+        labels = ", ".join(steps[step_number][0] for step_number in pending)
+        for step_number in pending:
+            self.status.start_step(section_number, step_number)
+        with self._status(f"Running {labels} concurrently..."):
+            with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                futures = {step_number: pool.submit(jobs[step_number]) for step_number in pending}
+                errors = []
+                results = {}
+                for step_number, future in futures.items():
+                    try:
+                        results[step_number] = future.result()
+                    except Exception as exc:
+                        errors.append(exc)
+                        self.console.print(f"[red] {steps[step_number][0].capitalize()} failed: {exc}[/red]")
+
+        for step_number, text in sorted(results.items()):
+            _, subfolder, filename, step_name = steps[step_number]
+            output_path = self.exporter.save_file(chapter_dir, subfolder, filename, text, section, step_name)
+            self.record_inputs(output_path, inputs[step_number])
+            self.status.update_step(section_number, step_number, section)
+        if errors:
+            raise errors[0]
+
     def run_full(
         self,
         section_number: int,
@@ -98,6 +302,9 @@ class Pipeline:
         start_from: int = 0,
         force: bool = False,
         only_step: int | None = None,
+        concurrent: bool = False,
+        interactive: bool = True,
+        salvage: bool = False,
     ) -> None:
         section = self.get_section(section_number)
         chapter_dir = self.get_chapter_dir(section)
@@ -124,58 +331,88 @@ class Pipeline:
                 else:
                     self.console.print("[yellow]Section flagged for Deep Research but no research.md found.[/yellow]")
                     self.console.print(f"[dim]Run Gemini Deep Research manually and save to: {research_path}[/dim]")
-                    user_choice = input("Press Enter to use automated API research instead, or Ctrl+C to cancel: ")
+                    if interactive:
+                        user_choice = input("Press Enter to use automated API research instead, or Ctrl+C to cancel: ")
+                    else:
+                        self.console.print("[dim]Non-interactive run: using automated API research.[/dim]")
+                        user_choice = ""
                     if user_choice is not None:
-                        with Status("Running automated research...", console=self.console):
+                        self.status.start_step(section_number, 0)
+                        with self._status("Running automated research..."):
                             research = self.researcher.research_section(section, chapter_dir)
                         self.exporter.save_file(chapter_dir, "research", "research.md", research, section, "research")
+                        self.record_inputs(research_path, self.step_inputs(0, section, chapter_dir))
                         self.status.update_step(section_number, 0, section)
             else:
-                if self._skip_or_run(research_path, force):
-                    self.console.print("[yellow] Skipping research (file exists)[/yellow]")
+                research_inputs = self.step_inputs(0, section, chapter_dir)
+                if self.skip_or_run(research_path, force, research_inputs):
+                    self.console.print("[yellow] Skipping research (up to date)[/yellow]")
                 else:
-                    with Status("Running research...", console=self.console):
+                    self.status.start_step(section_number, 0)
+                    with self._status("Running research..."):
                         research = self.researcher.research_section(section, chapter_dir)
                     self.exporter.save_file(chapter_dir, "research", "research.md", research, section, "research")
+                    self.record_inputs(research_path, research_inputs)
                     self.status.update_step(section_number, 0, section)
 
         # Step 1: Draft
         if self._should_run(1, start_from, only_step):
-            if self._skip_or_run(draft_path, force):
-                self.console.print("[yellow] Skipping draft (file exists)[/yellow]")
+            # The source files stand in for the excerpts, which are only selected when drafting.
+            draft_inputs = self.step_inputs(
+                1, section, chapter_dir, context=additional_context, sources=self.source_loader.fingerprint()
+            )
+            if self.skip_or_run(draft_path, force, draft_inputs):
+                self.console.print("[yellow] Skipping draft (up to date)[/yellow]")
             else:
-                research_content = _strip_front_matter(self.exporter.load_file(chapter_dir, "research", "research.md"))
-                # Load relevant source material from existing files
-                source_material = self.source_loader.get_source_material(section)
-                if source_material:
-                    self.console.print(f"[green] Loaded source material ({len(source_material)} chars)[/green]")
-                with Status("Drafting chapter...", console=self.console):
-                    draft = self.writer.draft_section(
-                        section, research_content, additional_context,
-                        source_material=source_material,
-                        chapter_dir=chapter_dir,
-                    )
+                self.status.start_step(section_number, 1)
+                if force:
+                    self._discard_partial(draft_path)
+                draft = self._salvage_partial(draft_path, "draft") if salvage else None
+                salvaged = draft is not None
+                if draft is None:
+                    research_content = strip_front_matter(self.exporter.load_file(chapter_dir, "research", "research.md"))
+                    # Load relevant source material from existing files
+                    source_material = self.source_loader.get_source_material(section)
+                    if source_material:
+                        self.console.print(f"[green] Loaded source material ({len(source_material)} chars)[/green]")
+                    with self._status("Drafting chapter...") as status:
+                        draft = self.writer.draft_section(
+                            section, research_content, additional_context,
+                            source_material=source_material,
+                            chapter_dir=chapter_dir,
+                            partial_path=self._partial_path(draft_path),
+                            on_progress=self._progress(status, "Drafting chapter..."),
+                        )
                 self.exporter.save_file(chapter_dir, "drafts", "draft-1-claude.md", draft, section, "draft")
+                self.record_inputs(draft_path, SALVAGED if salvaged else draft_inputs)
                 self.status.update_step(section_number, 1, section)
 
+        # Steps 2-4 only read the first draft, so --concurrent fans them out together.
+        fan_out = concurrent and only_step is None
+        if fan_out:
+            self._run_feedback_concurrently(section, chapter_dir, start_from, force)
+
         # Step 2: Expand
-        if self._should_run(2, start_from, only_step):
+        if not fan_out and self._should_run(2, start_from, only_step):
             if only_step is not None:
                 self._require_file(
                     draft_path,
                     f"Missing draft for expansion. Run: bookforge write {section_number} --only 1",
                 )
-            if self._skip_or_run(expansion_path, force):
-                self.console.print("[yellow] Skipping expansion (file exists)[/yellow]")
+            expansion_inputs = self.step_inputs(2, section, chapter_dir)
+            if self.skip_or_run(expansion_path, force, expansion_inputs):
+                self.console.print("[yellow] Skipping expansion (up to date)[/yellow]")
             else:
-                draft = _strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-1-claude.md"))
-                with Status("Expanding content...", console=self.console):
+                self.status.start_step(section_number, 2)
+                draft = strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-1-claude.md"))
+                with self._status("Expanding content..."):
                     expanded = self.expander.expand_section(section, draft, chapter_dir)
                 self.exporter.save_file(chapter_dir, "drafts", "expansion-notes.md", expanded, section, "expand")
+                self.record_inputs(expansion_path, expansion_inputs)
                 self.status.update_step(section_number, 2, section)
 
         # Step 3: Fact-check
-        if self._should_run(3, start_from, only_step):
+        if not fan_out and self._should_run(3, start_from, only_step):
             if only_step is not None:
                 self._require_file(
                     draft_path,
@@ -185,30 +422,36 @@ class Pipeline:
                     expansion_path,
                     f"Missing expansion notes for fact-check. Run: bookforge write {section_number} --only 2",
                 )
-            if self._skip_or_run(fact_path, force):
-                self.console.print("[yellow] Skipping fact-check (file exists)[/yellow]")
+            fact_inputs = self.step_inputs(3, section, chapter_dir)
+            if self.skip_or_run(fact_path, force, fact_inputs):
+                self.console.print("[yellow] Skipping fact-check (up to date)[/yellow]")
             else:
-                draft = _strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-1-claude.md"))
-                expansion = _strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "expansion-notes.md"))
-                with Status("Fact-checking...", console=self.console):
+                self.status.start_step(section_number, 3)
+                draft = strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-1-claude.md"))
+                expansion = strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "expansion-notes.md"))
+                with self._status("Fact-checking..."):
                     report = self.checker.check_section(section, draft, expansion, chapter_dir)
                 self.exporter.save_file(chapter_dir, "reports", "fact-check-report.md", report, section, "fact_check")
+                self.record_inputs(fact_path, fact_inputs)
                 self.status.update_step(section_number, 3, section)
 
         # Step 4: Review
-        if self._should_run(4, start_from, only_step):
+        if not fan_out and self._should_run(4, start_from, only_step):
             if only_step is not None:
                 self._require_file(
                     draft_path,
                     f"Missing draft for review. Run: bookforge write {section_number} --only 1",
                 )
-            if self._skip_or_run(review_path, force):
-                self.console.print("[yellow] Skipping review (file exists)[/yellow]")
+            review_inputs = self.step_inputs(4, section, chapter_dir)
+            if self.skip_or_run(review_path, force, review_inputs):
+                self.console.print("[yellow] Skipping review (up to date)[/yellow]")
             else:
-                draft = _strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-1-claude.md"))
-                with Status("Reviewing quality...", console=self.console):
+                self.status.start_step(section_number, 4)
+                draft = strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-1-claude.md"))
+                with self._status("Reviewing quality..."):
                     review = self.reviewer.review_section(section, draft, chapter_dir)
                 self.exporter.save_file(chapter_dir, "reports", "review-report.md", review, section, "review")
+                self.record_inputs(review_path, review_inputs)
                 self.status.update_step(section_number, 4, section)
 
         # Step 5: Revise
@@ -230,17 +473,29 @@ class Pipeline:
                     review_path,
                     f"Missing review report for revision. Run: bookforge write {section_number} --only 4",
                 )
-            if self._skip_or_run(revised_path, force):
-                self.console.print("[yellow] Skipping revision (file exists)[/yellow]")
+            revision_inputs = self.step_inputs(5, section, chapter_dir)
+            if self.skip_or_run(revised_path, force, revision_inputs):
+                self.console.print("[yellow] Skipping revision (up to date)[/yellow]")
             else:
-                draft = _strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-1-claude.md"))
-                expansion = _strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "expansion-notes.md"))
-                facts = _strip_front_matter(self.exporter.load_file(chapter_dir, "reports", "fact-check-report.md"))
-                review = _strip_front_matter(self.exporter.load_file(chapter_dir, "reports", "review-report.md"))
-                human_notes = _strip_front_matter(self.exporter.load_file(chapter_dir, "reports", "human-notes.md"))
-                with Status("Revising chapter...", console=self.console):
-                    revised = self.writer.revise_section(section, draft, expansion, facts, review, human_notes, chapter_dir)
+                self.status.start_step(section_number, 5)
+                if force:
+                    self._discard_partial(revised_path)
+                revised = self._salvage_partial(revised_path, "revision") if salvage else None
+                salvaged = revised is not None
+                if revised is None:
+                    draft = strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-1-claude.md"))
+                    expansion = strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "expansion-notes.md"))
+                    facts = strip_front_matter(self.exporter.load_file(chapter_dir, "reports", "fact-check-report.md"))
+                    review = strip_front_matter(self.exporter.load_file(chapter_dir, "reports", "review-report.md"))
+                    human_notes = strip_front_matter(self.exporter.load_file(chapter_dir, "reports", "human-notes.md"))
+                    with self._status("Revising chapter...") as status:
+                        revised = self.writer.revise_section(
+                            section, draft, expansion, facts, review, human_notes, chapter_dir,
+                            partial_path=self._partial_path(revised_path),
+                            on_progress=self._progress(status, "Revising chapter..."),
+                        )
                 self.exporter.save_file(chapter_dir, "drafts", "draft-2-revised.md", revised, section, "revise")
+                self.record_inputs(revised_path, SALVAGED if salvaged else revision_inputs)
                 self.status.update_step(section_number, 5, section)
 
         # Step 6: Readability
@@ -250,13 +505,16 @@ class Pipeline:
                     revised_path,
                     f"Missing revised draft for readability. Run: bookforge write {section_number} --only 5",
                 )
-            if self._skip_or_run(readability_path, force):
-                self.console.print("[yellow] Skipping readability (file exists)[/yellow]")
+            readability_inputs = self.step_inputs(6, section, chapter_dir)
+            if self.skip_or_run(readability_path, force, readability_inputs):
+                self.console.print("[yellow] Skipping readability (up to date)[/yellow]")
             else:
-                revised = _strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-2-revised.md"))
-                with Status("Analyzing readability...", console=self.console):
+                self.status.start_step(section_number, 6)
+                revised = strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-2-revised.md"))
+                with self._status("Analyzing readability..."):
                     report = self.readability.analyze_readability(revised, section)
                 self.exporter.save_file(chapter_dir, "reports", "readability-report.md", report, section, "readability")
+                self.record_inputs(readability_path, readability_inputs)
                 self.status.update_step(section_number, 6, section)
 
         # Step 7: Human review
@@ -282,17 +540,26 @@ class Pipeline:
                     )
             graphics_prompts_path = chapter_dir / "prompts" / "graphic-prompts.md"
             graphics_tasks_path = chapter_dir / "graphics" / "graphics-tasks.md"
-            if self._skip_or_run(graphics_tasks_path, force):
-                self.console.print("[yellow] Skipping graphics (file exists)[/yellow]")
+            graphics_inputs = self.step_inputs(
+                8, section, chapter_dir,
+                image_mode=self.config.image_mode,
+                image_settings=[
+                    self.config.image_size, self.config.image_quality,
+                    self.config.image_background, self.config.image_format,
+                ],
+            )
+            if self.skip_or_run(graphics_tasks_path, force, graphics_inputs):
+                self.console.print("[yellow] Skipping graphics (up to date)[/yellow]")
             else:
-                source_text = _strip_front_matter(
+                self.status.start_step(section_number, 8)
+                source_text = strip_front_matter(
                     self.exporter.load_file(chapter_dir, "final", f"{section['number']:02d}-{section['slug']}.md")
                     or self.exporter.load_file(chapter_dir, "drafts", "draft-2-revised.md")
                 )
                 if not source_text:
                     self.console.print("[red]No draft available for graphics step.[/red]")
                 else:
-                    with Status("Generating graphic prompts...", console=self.console):
+                    with self._status("Generating graphic prompts..."):
                         prompts_md, tasks_md, manifest = self.graphic_prompter.generate_graphic_tasks(source_text, section)
                     graphics_prompts_path = self.exporter.save_file(
                         chapter_dir, "prompts", "graphic-prompts.md", prompts_md, section, "graphics_prompts"
@@ -307,14 +574,15 @@ class Pipeline:
                     self.console.print(f"[green] Graphics manifest saved[/green] [dim]{manifest_path}[/dim]")
                     image_mode = (self.config.image_mode or "prompts").lower().strip()
                     if image_mode in {"api", "both"}:
-                        with Status("Generating images via API...", console=self.console):
+                        with self._status("Generating images via API..."):
                             created = self.image_generator.generate_images(manifest, chapter_dir)
                         if created:
                             self.console.print(f"[green] Images generated:[/green] {len(created)}")
+                    self.record_inputs(graphics_tasks_path, graphics_inputs)
                     self.status.update_step(section_number, 8, section)
 
         # Summary
-        revised_text = _strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-2-revised.md"))
+        revised_text = strip_front_matter(self.exporter.load_file(chapter_dir, "drafts", "draft-2-revised.md"))
         word_count = len(revised_text.split()) if revised_text else 0
         fact_report = self.exporter.load_file(chapter_dir, "reports", "fact-check-report.md") or ""
         fact_issues = len(re.findall(r"\b(INCORRECT|FABRICATED|OUTDATED)\b", fact_report))
@@ -0,0 +1,51 @@
+"""On-disk store of the paragraphs extracted from each source document.
+
+Parsing a large .docx takes far longer than reading back its text, so the
+``(text, location)`` blocks of every document in source-files/ are kept as
+gzipped JSON under ``.cache/sources/``. Entries are named by the document's
+sha256 and the extractor version. The sha256 comes from the source index stamp,
+which reuses the stored hash while a file's size and mtime are unchanged. A
+warm start therefore never re-hashes or re-parses an unchanged document. Only
+changed documents are extracted again.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+from pathlib import Path
+
+
+class ParagraphStore:
+    def __init__(self, store_dir: Path, version: int):
+        self.store_dir = store_dir
+        self.version = version
+
+    def _path(self, stamp: dict) -> Path:
+        return self.store_dir / f"{stamp['sha256']}.v{self.version}.json.gz"
+
+    def get(self, stamp: dict) -> list[tuple[str, str]] | None:
+        try:
+            with gzip.open(self._path(stamp), "rt", encoding="utf-8") as handle:
+                return [(text, location) for text, location in json.load(handle)]
+        except (OSError, ValueError, EOFError):
+            return None  # missing or damaged: extract again
+
+    def put(self, stamp: dict, blocks: list[tuple[str, str]]) -> None:
+        path = self._path(stamp)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+            json.dump(blocks, handle, ensure_ascii=False)
+        tmp_path.replace(path)
+
+    def retain(self, stamps: list[dict]) -> None:
+        """Delete entries for documents (or extractor versions) no longer in use."""
+        if not self.store_dir.exists():
+            return
+        keep = {self._path(stamp).name for stamp in stamps}
+        for path in self.store_dir.glob("*.json.gz"):
+            if path.name not in keep:
+                path.unlink(missing_ok=True)
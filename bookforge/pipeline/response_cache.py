@@ -0,0 +1,118 @@
+"""Content-addressed on-disk cache of LLM responses.
+
+Entries are keyed by a hash of everything that determines a response
+(provider, model, system prompt, user prompt, max_tokens), so a re-run with
+``--force`` or a rebuild after a crash replays identical requests for free.
+Each entry is one small JSON file; its mtime doubles as the LRU timestamp.
+
+Eviction scans the whole cache directory, so it runs on the first store of a
+session and then only when the running size total passes ``max_bytes``. It trims
+the cache to ``EVICT_TO`` of the limit, so the next scan is many stores away.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+class ResponseCache:
+    # Fraction of max_bytes left after an eviction that had to drop entries for size.
+    EVICT_TO = 0.9
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 500 * 1024 * 1024,
+        max_age_days: float = 30.0,
+        bypass: bool = False,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        # Bypass skips lookups but still stores fresh responses for the next run.
+        self.bypass = bypass
+        self._lock = threading.Lock()
+        # Bytes on disk as of the last scan plus what this process stored since; None until scanned.
+        self._total_bytes: int | None = None
+
+    @staticmethod
+    def make_key(provider: str, model: str, system: str, prompt: str, max_tokens: int) -> str:
+        payload = json.dumps([provider, model, system, prompt, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        """Return ``{"text", "input_tokens", "output_tokens"}`` for a cached response, or None."""
+        if self.bypass:
+            return None
+        path = self._path(key)
+        try:
+            age = time.time() - path.stat().st_mtime
+            if age > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key: str, text: str, input_tokens: int, output_tokens: int, provider: str, model: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "provider": provider,
+            "model": model,
+            "created": datetime.utcnow().isoformat(),
+            "text": text,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+        }
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data) - replaced
+            needs_scan = self._total_bytes is None or self._total_bytes > self.max_bytes
+        if needs_scan:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then (if over ``max_bytes``) the least recently used down to ``EVICT_TO`` of it."""
+        with self._lock:
+            if not self.cache_dir.exists():
+                return
+            now = time.time()
+            entries = []
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.max_age_seconds:
+                    path.unlink(missing_ok=True)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * self.EVICT_TO if total > self.max_bytes else self.max_bytes
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+            self._total_bytes = total
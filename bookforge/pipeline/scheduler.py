@@ -0,0 +1,174 @@
+"""Multi-section scheduler for BookForge.
+
+Builds a dependency graph from toc.json (``depends_on`` edges, ``build_order``
+priority) and runs ``Pipeline.run_full`` for every section whose dependencies
+are finished, several at a time. Progress is written to a run log so an
+interrupted book build resumes with only the unfinished sections.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+DONE = "done"
+FAILED = "failed"
+BLOCKED = "blocked"
+PENDING = "pending"
+RUNNING = "running"
+
+
+def build_graph(sections: list[dict], selected: set[int] | None = None) -> dict[int, set[int]]:
+    """Map each selected section number to the selected sections it depends on.
+
+    Dependencies outside the selection are treated as already satisfied.
+    Raises ValueError for unknown section numbers and dependency cycles.
+    """
+    by_number = {section["number"]: section for section in sections}
+    if selected is None:
+        selected = set(by_number)
+    unknown = selected - set(by_number)
+    if unknown:
+        raise ValueError(f"Sections not found in toc.json: {sorted(unknown)}")
+
+    graph = {}
+    for number in selected:
+        deps = set(by_number[number].get("depends_on", []))
+        missing = deps - set(by_number)
+        if missing:
+            raise ValueError(f"Section {number} depends on unknown sections: {sorted(missing)}")
+        graph[number] = deps & selected
+
+    # Kahn's algorithm: anything left over sits on a cycle.
+    remaining = {number: set(deps) for number, deps in graph.items()}
+    while remaining:
+        ready = [number for number, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between sections: {sorted(remaining)}")
+        for number in ready:
+            del remaining[number]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return graph
+
+
+class RunLog:
+    """JSON record of per-section state for one multi-section build."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.data: dict = {}
+
+    def load(self, fresh: bool = False) -> dict:
+        if self.path.exists() and not fresh:
+            self.data = json.loads(self.path.read_text(encoding="utf-8"))
+        else:
+            self.data = {"started": datetime.utcnow().isoformat(), "sections": {}}
+        return self.data
+
+    def state(self, number: int) -> str:
+        return self.data["sections"].get(str(number), {}).get("state", PENDING)
+
+    def mark(self, number: int, state: str, error: str | None = None) -> None:
+        with self._lock:
+            entry = self.data["sections"].setdefault(str(number), {})
+            now = datetime.utcnow().isoformat()
+            entry["state"] = state
+            if state == RUNNING:
+                entry["started"] = now
+                entry.pop("finished", None)
+            else:
+                entry["finished"] = now
+            if error:
+                entry["error"] = error
+            else:
+                entry.pop("error", None)
+            self._save()
+
+    def _save(self) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.data, indent=2), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+
+class SectionScheduler:
+    """Runs the per-section pipeline across the book in dependency order."""
+
+    def __init__(self, pipeline, run_log_path: Path, workers: int = 3):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.pipeline = pipeline
+        self.console = pipeline.console
+        self.run_log = RunLog(run_log_path)
+        self.workers = workers
+
+    def run(self, sections: list[int] | None = None, fresh: bool = False, **run_kwargs) -> dict[int, str]:
+        """Run every selected section and return its final state.
+
+        ``run_kwargs`` are passed through to ``Pipeline.run_full``. Sections
+        already marked done in the run log are skipped unless ``fresh`` is set.
+        """
+        toc = json.loads(self.pipeline.toc_path.read_text(encoding="utf-8"))
+        graph = build_graph(toc["sections"], set(sections) if sections else None)
+        order = {section["number"]: section["build_order"] for section in toc["sections"]}
+        self.run_log.load(fresh)
+
+        states = {}
+        for number in graph:
+            state = self.run_log.state(number)
+            # Anything that did not finish last time (running, failed, blocked) starts over.
+            states[number] = DONE if state == DONE else PENDING
+        skipped = sorted(number for number, state in states.items() if state == DONE)
+        if skipped and len(skipped) == len(states):
+            self.console.print("[yellow] All selected sections are complete in the run log. Use --fresh to rebuild.[/yellow]")
+        elif skipped:
+            self.console.print(f"[yellow] Resuming: sections {skipped} already complete in run log[/yellow]")
+
+        def _run_one(number: int) -> None:
+            self.pipeline.run_full(number, interactive=False, **run_kwargs)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = {}
+            while True:
+                for number in sorted(graph, key=lambda n: order[n]):
+                    if states[number] != PENDING:
+                        continue
+                    dep_states = {states[dep] for dep in graph[number]}
+                    if dep_states & {FAILED, BLOCKED}:
+                        states[number] = BLOCKED
+                        self.run_log.mark(number, BLOCKED, "A dependency did not complete.")
+                        continue
+                    if dep_states - {DONE} or len(running) >= self.workers:
+                        continue
+                    states[number] = RUNNING
+                    self.run_log.mark(number, RUNNING)
+                    self.console.print(f"[blue] Starting section {number}[/blue]")
+                    running[pool.submit(_run_one, number)] = number
+
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    number = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        states[number] = FAILED
+                        self.run_log.mark(number, FAILED, str(exc))
+                        self.console.print(f"[red] Section {number} failed: {exc}[/red]")
+                    else:
+                        states[number] = DONE
+                        self.run_log.mark(number, DONE)
+                        self.console.print(f"[green] Section {number} complete[/green]")
+
+        # Whatever is still pending waits on a dependency that never finished.
+        for number, state in states.items():
+            if state == PENDING:
+                states[number] = BLOCKED
+                self.run_log.mark(number, BLOCKED, "A dependency did not complete.")
+        return states
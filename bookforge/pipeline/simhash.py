@@ -0,0 +1,109 @@
+"""SimHash fingerprints for spotting near-duplicate paragraphs.
+
+A paragraph's 64-bit SimHash is the bitwise majority vote of the hashes of
+its overlapping three-word shingles. Paragraphs that share most of their
+wording get fingerprints a few bits apart. Two fingerprints within
+``MAX_DISTANCE`` bits count as duplicates. Footnote markers and leading list
+markers ("B.", "1.2", "(a)", bullets) are ignored, so the same sentence copied
+with and without its reference number or enumerator still matches.
+
+A few changed shingles can still flip many near-tied bits: on the bundled
+sources, one or three extra opening words often move a fingerprint 8 bits or
+more, and a short paragraph has too few shingles to absorb even one. So a
+paragraph SimHash does not flag is also compared by the Jaccard similarity of
+its word set, and counts as a duplicate at ``MIN_JACCARD`` or above.
+
+``NearDuplicateFilter`` finds close fingerprints without comparing against
+everything kept so far. The fingerprint is split into ``MAX_DISTANCE + 1``
+bands. By the pigeonhole principle, two fingerprints within the distance agree
+exactly on at least one band, so only entries sharing a band are compared.
+Word sets are compared only with kept paragraphs sharing a word.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+import numpy as np
+
+from pipeline.source_index import tokenize
+
+BITS = 64
+MAX_DISTANCE = 3
+SHINGLE = 3
+MIN_JACCARD = 0.7
+
+# Footnote markers glued to the end of a word or sentence ("pauses3.").
+_FOOTNOTE_RE = re.compile(r"(?<=[A-Za-z.)\]\"”’])\d{1,2}\b")
+# List markers and enumerators at the start of a paragraph: "B. ", "1.2 ", "(a) ", "iv) ", "• ".
+_MARKER_RE = re.compile(
+    r"^(?:[-*•·–—▪◦]\s*|\(?(?:\d+(?:\.\d+)*|[A-Za-z]|[IVXLCDM]+|[ivxlcdm]+)[.)]\s+|\d+(?:\.\d+)+\s+)+"
+)
+_SHIFTS = np.arange(BITS, dtype=np.uint64)
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def words(text: str) -> list[str]:
+    """The words a paragraph is compared on, without footnote or leading list markers."""
+    return tokenize(_FOOTNOTE_RE.sub("", _MARKER_RE.sub("", text.strip())))
+
+
+def simhash(text: str) -> int:
+    return _simhash(words(text))
+
+
+def _simhash(tokens: list[str]) -> int:
+    if len(tokens) > SHINGLE:
+        features = [" ".join(tokens[i : i + SHINGLE]) for i in range(len(tokens) - SHINGLE + 1)]
+    else:
+        features = [" ".join(tokens)]
+    # Majority vote per bit, over all features at once.
+    hashes = np.array([_feature_hash(feature) for feature in features], dtype=np.uint64)
+    ones = (hashes[:, None] >> _SHIFTS & np.uint64(1)).sum(axis=0)
+    return int(np.packbits(ones * 2 > len(features), bitorder="little").view("<u8")[0])
+
+
+class NearDuplicateFilter:
+    """Remembers kept paragraphs and recognizes near-duplicates of them."""
+
+    def __init__(self, max_distance: int = MAX_DISTANCE, min_jaccard: float = MIN_JACCARD):
+        self.max_distance = max_distance
+        self.min_jaccard = min_jaccard
+        self._bands = max_distance + 1
+        self._width = BITS // self._bands
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in range(self._bands)]
+        self._word_sets: list[frozenset[str]] = []  # one per kept paragraph
+        self._by_word: dict[str, list[int]] = {}
+
+    def _band_keys(self, fingerprint: int) -> list[int]:
+        mask = (1 << self._width) - 1
+        return [fingerprint >> (band * self._width) & mask for band in range(self._bands)]
+
+    def is_duplicate(self, text: str) -> bool:
+        tokens = words(text)
+        fingerprint = _simhash(tokens)
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            for other in self._buckets[band].get(key, ()):
+                if bin(fingerprint ^ other).count("1") <= self.max_distance:
+                    return True
+        word_set = frozenset(tokens)
+        candidates = {position for word in word_set for position in self._by_word.get(word, ())}
+        for position in candidates:
+            other = self._word_sets[position]
+            if len(word_set & other) >= self.min_jaccard * len(word_set | other):
+                return True
+        return False
+
+    def add(self, text: str) -> None:
+        tokens = words(text)
+        fingerprint = _simhash(tokens)
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            self._buckets[band].setdefault(key, []).append(fingerprint)
+        word_set = frozenset(tokens)
+        for word in word_set:
+            self._by_word.setdefault(word, []).append(len(self._word_sets))
+        self._word_sets.append(word_set)
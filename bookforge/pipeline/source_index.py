@@ -0,0 +1,204 @@
+"""Persistent inverted index over the paragraphs in source-files/.
+
+``source-files/.index.json`` maps every lowercase word token to the paragraphs
+that contain it, with its term frequency, per source file. Each file entry is
+stamped with the file's size, mtime and sha256. An entry is reused while size
+and mtime match. If they differ but the hash does not, only the stamp is
+refreshed. Otherwise that one file is re-indexed.
+
+A keyword matches where a word starts with it, so the deliberate prefixes in
+the topic lists still work (``"certif"`` matches "certification"). Keywords
+whose last word is short must also end at a word boundary, so "um" matches
+"um" but not "argument" (see ``keyword_pattern``). A single-word keyword
+expands to the vocabulary tokens it matches. For a phrase or a keyword with
+punctuation, each word piece is looked up the same way, and the postings of
+the matching tokens give the candidate paragraphs. A keyword's candidates are
+the intersection over its pieces. The caller confirms each candidate against
+the text with ``keyword_pattern``, so the index only ever narrows the search
+and never changes what matches.
+
+Per-paragraph token counts are kept for length normalization.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+
+INDEX_NAME = ".index.json"
+# Bump when tokenization changes, so stale indexes rebuild. Extraction changes
+# are tracked by the extractor version passed in by the loader.
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"\w+")
+# Keyword words up to this long match whole words only ("um", "ai"); longer
+# ones also match the start of a longer word ("rate" in "rates", not "accurate").
+SHORT_WORD = 3
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def keyword_pattern(keyword: str) -> re.Pattern:
+    """Case-insensitive pattern for ``keyword`` starting at a word boundary.
+
+    The match must also end at a word boundary when the keyword's last word is
+    ``SHORT_WORD`` characters or fewer.
+    """
+    lowered = keyword.lower()
+    start = r"\b" if lowered[:1].isalnum() or lowered[:1] == "_" else ""
+    pieces = tokenize(lowered)
+    whole = bool(pieces) and lowered.endswith(pieces[-1]) and len(pieces[-1]) <= SHORT_WORD
+    return re.compile(start + re.escape(lowered) + (r"\b" if whole else ""), re.IGNORECASE)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SourceIndex:
+    def __init__(self, path: Path, extractor: int = 0):
+        self.path = path
+        # Version of the paragraph extraction the postings were built from.
+        self.extractor = extractor
+        self.files: dict[str, dict] = {}
+        self._dirty = False
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._lengths: list[int] = []
+        self._vocabulary: list[str] = []
+        self._piece_tokens: dict[tuple[str, bool], set[str]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return  # missing or damaged: everything is re-indexed
+        if data.get("version") == INDEX_VERSION and data.get("extractor") == self.extractor:
+            self.files = data.get("files", {})
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"version": INDEX_VERSION, "extractor": self.extractor, "files": self.files}), encoding="utf-8")
+        tmp_path.replace(self.path)
+        self._dirty = False
+
+    def stamp(self, path: Path) -> dict:
+        """Size, mtime and sha256 of ``path``; the hash is reused while size and mtime match."""
+        stat = path.stat()
+        previous = self.files.get(path.name, {}).get("stamp", {})
+        if previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+            return previous
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": _sha256(path)}
+
+    def is_current(self, name: str, stamp: dict) -> bool:
+        entry = self.files.get(name)
+        if entry is None or entry["stamp"].get("sha256") != stamp["sha256"]:
+            return False
+        if entry["stamp"] != stamp:
+            # Touched but unchanged: keep the postings, remember the new mtime.
+            entry["stamp"] = stamp
+            self._dirty = True
+        return True
+
+    def add_file(self, name: str, stamp: dict, paragraphs: list[str]) -> None:
+        postings: dict[str, list[list[int]]] = {}
+        lengths = []
+        for position, paragraph in enumerate(paragraphs):
+            counts = Counter(tokenize(paragraph))
+            lengths.append(sum(counts.values()))
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append([position, tf])
+        self.files[name] = {"stamp": stamp, "paragraphs": len(paragraphs), "lengths": lengths, "postings": postings}
+        self._dirty = True
+
+    def retain(self, names: set[str]) -> None:
+        """Forget files that are no longer in source-files/."""
+        for name in set(self.files) - names:
+            del self.files[name]
+            self._dirty = True
+
+    def activate(self, order: list[str]) -> None:
+        """Merge the per-file postings into one index whose paragraph ids follow ``order``."""
+        postings: dict[str, list[tuple[int, int]]] = {}
+        lengths: list[int] = []
+        offset = 0
+        for name in order:
+            entry = self.files[name]
+            for token, items in entry["postings"].items():
+                postings.setdefault(token, []).extend((offset + position, tf) for position, tf in items)
+            lengths.extend(entry["lengths"])
+            offset += entry["paragraphs"]
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+        self._lengths = lengths
+        self._piece_tokens = {}
+
+    def _tokens_matching(self, piece: str, whole: bool) -> set[str]:
+        """``piece`` itself if it is a token, or with ``whole`` false every token starting with it."""
+        key = (piece, whole)
+        if key not in self._piece_tokens:
+            if whole:
+                tokens = {piece} if piece in self._postings else set()
+            else:
+                tokens = set()
+                for token in self._vocabulary[bisect_left(self._vocabulary, piece):]:
+                    if not token.startswith(piece):
+                        break
+                    tokens.add(token)
+            self._piece_tokens[key] = tokens
+        return self._piece_tokens[key]
+
+    def _paragraphs_with(self, piece: str, whole: bool) -> set[int]:
+        ids: set[int] = set()
+        for token in self._tokens_matching(piece, whole):
+            ids.update(paragraph_id for paragraph_id, _ in self._postings[token])
+        return ids
+
+    def expand(self, word: str) -> set[str]:
+        """Vocabulary tokens a single-word keyword matches."""
+        word = word.lower()
+        return self._tokens_matching(word, len(word) <= SHORT_WORD)
+
+    def keyword_candidates(self, keyword: str) -> set[int] | None:
+        """Ids of paragraphs that may contain ``keyword``; None if it has no word characters.
+
+        Every word piece but the last is followed by more of the keyword, so it
+        must be a whole token; the last follows the ``SHORT_WORD`` rule.
+        """
+        pieces = tokenize(keyword)
+        if not pieces:
+            return None
+        ids: set[int] | None = None
+        for position, piece in enumerate(pieces):
+            whole = position < len(pieces) - 1 or len(piece) <= SHORT_WORD
+            found = self._paragraphs_with(piece, whole)
+            ids = found if ids is None else ids & found
+            if not ids:
+                break
+        return ids
+
+    @property
+    def postings(self) -> dict[str, list[tuple[int, int]]]:
+        """Active postings: token -> ``(paragraph_id, tf)`` pairs."""
+        return self._postings
+
+    def length(self, paragraph_id: int) -> int:
+        """Number of tokens in a paragraph."""
+        return self._lengths[paragraph_id]
+
+    @property
+    def average_length(self) -> float:
+        return sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
@@ -7,10 +7,37 @@ existing research/outline content and the chapter drafting step.
 
 from __future__ import annotations
 
+import multiprocessing
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
-from docx import Document
+import numpy as np
+
+from pipeline.docx_reader import iter_docx
+from pipeline.paragraph_store import ParagraphStore
+from pipeline.simhash import NearDuplicateFilter
+from pipeline.source_index import INDEX_NAME, SourceIndex, keyword_pattern, tokenize
+from pipeline.vector_search import VectorRetriever
+
+# BM25 term-frequency saturation and length normalization.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_QUERY_STOPWORDS = {
+    "and", "the", "for", "with", "from", "this", "that", "your", "their", "into", "when", "what",
+    "how", "why", "are", "its", "not", "section", "part", "chapter",
+}
+
+# Weight of each section-level keyword in a subsection's query; the subsection's own words weigh 1.
+SECTION_KEYWORD_WEIGHT = 0.25
+
+# Drafts record the source files and this number, not the excerpts picked for them.
+# Bump it when a change to extraction or selection should redraft every section.
+SELECTION_VERSION = 1
 
 
 # Map keywords in subsection titles to relevant source content topics
@@ -51,35 +78,68 @@ _TOPIC_KEYWORDS = {
     "latin": ["latin", "mispronounce", "legal phrase"],
     "jurisdiction": ["jurisdiction", "state", "federal", "California", "Texas"],
 }
+# Topic keywords are used as written, however short ("um", "AI", "Q&A", "1099").
+_TOPIC_TERMS = {keyword.lower() for keywords in _TOPIC_KEYWORDS.values() for keyword in keywords}
+
+
+def _read_lines(path: Path) -> list[tuple[str, str]]:
+    text = path.read_text(encoding="utf-8", errors="replace")
+    return [(line.strip(), f"line {number}") for number, line in enumerate(text.split("\n"), 1) if line.strip()]
 
 
-def _extract_text_from_docx(path: Path) -> list[str]:
-    """Extract non-empty paragraph text from a .docx file."""
+def _extract_text_from_docx(path: Path) -> list[tuple[str, str]]:
+    """Extract ``(text, location)`` blocks from a .docx file.
+
+    Body paragraphs, footnotes, endnotes and headers come through one per block.
+    Table cells are joined per row (``"cell | cell | cell"``) so a rule or citation
+    keeps the row it belongs to.
+    """
     try:
-        doc = Document(str(path))
-        return [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+        blocks: list[tuple[str, str]] = []
+        row = None
+        for text, location in iter_docx(path):
+            if location.startswith("table "):
+                location = location.rsplit(", cell ", 1)[0]
+                if location == row:
+                    blocks[-1] = (f"{blocks[-1][0]} | {text}", row)
+                    continue
+            row = location
+            blocks.append((text, location))
+        return blocks
     except Exception:
         # If the file is actually plain text with a .docx extension
         try:
-            text = path.read_text(encoding="utf-8", errors="replace")
-            return [line.strip() for line in text.split("\n") if line.strip()]
+            return _read_lines(path)
         except Exception:
             return []
 
 
-def _extract_text_from_txt(path: Path) -> list[str]:
+def _extract_text_from_txt(path: Path) -> list[tuple[str, str]]:
     """Extract non-empty lines from a text file."""
     try:
-        text = path.read_text(encoding="utf-8", errors="replace")
-        return [line.strip() for line in text.split("\n") if line.strip()]
+        return _read_lines(path)
     except Exception:
         return []
 
 
-def _is_relevant(paragraph: str, keywords: list[str]) -> bool:
-    """Check if a paragraph is relevant to a set of keywords."""
-    lower = paragraph.lower()
-    return any(kw.lower() in lower for kw in keywords)
+# Extractor per file suffix. Bump EXTRACTOR_VERSION whenever extraction changes,
+# so cached paragraphs and the index are rebuilt.
+_EXTRACTORS = {
+    ".docx": _extract_text_from_docx,
+    ".txt": _extract_text_from_txt,
+    ".md": _extract_text_from_txt,
+}
+EXTRACTOR_VERSION = 3
+
+
+def _extract_document(path: str) -> list[tuple[str, str]]:
+    """``(text, location)`` blocks worth indexing from one source file.
+
+    Module-level so a process pool can pickle it; takes a plain path string.
+    """
+    source = Path(path)
+    # Skip very short fragments
+    return [(text, location) for text, location in _EXTRACTORS[source.suffix](source) if len(text) > 20]
 
 
 def _clean_paragraph(text: str) -> str:
@@ -122,62 +182,108 @@ def _gather_keywords_for_section(section: dict) -> list[str]:
     return list(set(keywords))
 
 
+def _content_words(text: str) -> list[str]:
+    return [word for word in tokenize(text) if len(word) > 2 and not word.isdigit() and word not in _QUERY_STOPWORDS]
+
+
 class SourceLoader:
     """Loads and filters source material for the writing pipeline."""
 
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, workers: int | None = None):
         self.source_dir = project_root / "source-files"
+        # Processes used to parse changed documents; defaults to the CPU count.
+        self.workers = workers or os.cpu_count() or 1
+        self.store = ParagraphStore(project_root / ".cache" / "sources", EXTRACTOR_VERSION)
         self._all_paragraphs: list[tuple[str, str]] | None = None  # (source_file, text)
+        self._locations: list[str] = []  # where each paragraph sits in its document
+        self._digests: dict[str, str] = {}  # source file -> sha256
+        self._index: SourceIndex | None = None
+        self._retriever: VectorRetriever | None = None
+        self._lock = threading.Lock()
 
     def _load_all(self) -> list[tuple[str, str]]:
-        """Load all source paragraphs once, lazily."""
-        if self._all_paragraphs is not None:
-            return self._all_paragraphs
+        """Load all source paragraphs once, lazily, and bring the index up to date.
 
-        self._all_paragraphs = []
-        if not self.source_dir.exists():
+        Paragraphs come from the paragraph store when a document is unchanged; only
+        new or edited documents are parsed.
+        """
+        with self._lock:
+            if self._all_paragraphs is not None:
+                return self._all_paragraphs
+
+            all_paragraphs = []
+            locations = []
+            index = SourceIndex(self.source_dir / INDEX_NAME, EXTRACTOR_VERSION)
+            order = []
+            if self.source_dir.exists():
+                paths = [path for path in sorted(self.source_dir.iterdir()) if path.suffix in _EXTRACTORS]
+                stamps = [index.stamp(path) for path in paths]
+                documents = [self.store.get(stamp) for stamp in stamps]
+                stale = [position for position, blocks in enumerate(documents) if blocks is None]
+                for position, blocks in zip(stale, self._extract([paths[position] for position in stale])):
+                    documents[position] = blocks
+                    self.store.put(stamps[position], blocks)
+
+                for path, stamp, blocks in zip(paths, stamps, documents):
+                    if not index.is_current(path.name, stamp):
+                        index.add_file(path.name, stamp, [text for text, _ in blocks])
+                    order.append(path.name)
+                    all_paragraphs.extend((path.name, text) for text, _ in blocks)
+                    locations.extend(location for _, location in blocks)
+                index.retain(set(order))
+                index.save()
+                self.store.retain(stamps)
+                self._digests = {path.name: stamp["sha256"] for path, stamp in zip(paths, stamps)}
+            index.activate(order)
+
+            self._index = index
+            self._retriever = VectorRetriever(index, len(all_paragraphs), BM25_K1, BM25_B)
+            self._locations = locations
+            self._all_paragraphs = all_paragraphs
             return self._all_paragraphs
 
-        for path in sorted(self.source_dir.iterdir()):
-            if path.suffix == ".docx":
-                paragraphs = _extract_text_from_docx(path)
-            elif path.suffix in (".txt", ".md"):
-                paragraphs = _extract_text_from_txt(path)
-            else:
-                continue
-
-            for para in paragraphs:
-                if len(para) > 20:  # Skip very short fragments
-                    self._all_paragraphs.append((path.name, para))
-
-        return self._all_paragraphs
+    def _extract(self, paths: list[Path]) -> list[list[tuple[str, str]]]:
+        """Parse documents, one per worker process; results come back in ``paths`` order."""
+        workers = min(self.workers, len(paths))
+        if workers <= 1:
+            return [_extract_document(str(path)) for path in paths]
+        try:
+            # Forking while the agent loop and worker threads run can copy a held lock
+            # into the child; spawned workers start clean.
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                return list(pool.map(_extract_document, [str(path) for path in paths]))
+        except (OSError, BrokenProcessPool):
+            # No usable process pool (restricted sandbox, frozen app): parse here instead.
+            return [_extract_document(str(path)) for path in paths]
+
+    def fingerprint(self) -> dict:
+        """What every section's source material derives from: the source files' hashes and ``SELECTION_VERSION``.
+
+        The draft step records this rather than the rendered excerpts, so checking
+        whether a draft is current ranks nothing.
+        """
+        self._load_all()
+        return {"selection": SELECTION_VERSION, "files": dict(self._digests)}
 
     def get_source_material(self, section: dict, max_chars: int = 12000) -> str:
         """Extract source material relevant to a specific section.
 
         Returns a formatted string of relevant excerpts that can be
-        injected into the writing prompt as reference material.
+        injected into the writing prompt as reference material. When the section
+        lists subsections, the excerpts are retrieved and grouped per subsection.
+        Otherwise one query of the section keywords picks them.
         """
         all_paras = self._load_all()
         if not all_paras:
             return ""
 
-        keywords = _gather_keywords_for_section(section)
-        if not keywords:
+        queries, phrases = self._queries(section)
+        if not queries:
             return ""
+        groups = list(zip(section.get("subsections") or [""], self._select(queries, phrases, max_chars)))
 
-        relevant = []
-        seen = set()
-        for source_file, para in all_paras:
-            if _is_relevant(para, keywords):
-                cleaned = _clean_paragraph(para)
-                # Deduplicate near-identical content
-                sig = cleaned[:80].lower()
-                if sig not in seen and len(cleaned) > 30:
-                    seen.add(sig)
-                    relevant.append((source_file, cleaned))
-
-        if not relevant:
+        if not any(selected for _, selected in groups):
             return ""
 
         # Build the source material block
@@ -189,15 +295,114 @@ class SourceLoader:
             "",
         ]
 
-        total_chars = 0
-        current_source = ""
-        for source_file, para in relevant:
-            if total_chars + len(para) > max_chars:
-                break
-            if source_file != current_source:
-                output_parts.append(f"\n--- From: {source_file} ---")
-                current_source = source_file
-            output_parts.append(para)
-            total_chars += len(para)
+        for subsection, selected in groups:
+            if not selected:
+                continue
+            if subsection:
+                output_parts.append(f"\n=== For subsection: {subsection} ===")
+            current_source = ""
+            # Present the chosen excerpts in document order so each source reads in sequence.
+            for paragraph_id in sorted(selected):
+                source_file, para = all_paras[paragraph_id]
+                location = self._locations[paragraph_id]
+                if source_file != current_source:
+                    output_parts.append(f"\n--- From: {source_file} ---")
+                    current_source = source_file
+                if location.startswith(("paragraph ", "line ")):
+                    output_parts.append(_clean_paragraph(para))
+                else:
+                    # Table rows, footnotes and headers lose their context out of place; say where they came from.
+                    output_parts.append(f"[{location}] {_clean_paragraph(para)}")
 
         return "\n".join(output_parts)
+
+    def _queries(self, section: dict) -> tuple[list[dict[str, float]], dict[str, dict[int, int]]]:
+        """One weighted query per subsection, or a single query without subsections.
+
+        A subsection's query holds its title words, plus the section keywords at
+        ``SECTION_KEYWORD_WEIGHT``. Also returns the paragraph counts of the
+        keywords that are phrases (see ``_keyword_terms``).
+        """
+        terms, phrases = self._keyword_terms(section)
+        context = dict.fromkeys(terms | phrases.keys(), SECTION_KEYWORD_WEIGHT)
+        subsections = section.get("subsections", [])
+        if not subsections:
+            return ([context] if context else []), phrases
+        return [{**context, **dict.fromkeys(_content_words(sub), 1.0)} for sub in subsections], phrases
+
+    def _keyword_terms(self, section: dict) -> tuple[set[str], dict[str, dict[int, int]]]:
+        """The section keywords as query terms, and per-paragraph counts for those that are phrases.
+
+        A single-word topic keyword becomes every index token it matches: tokens
+        starting with it ("terminol" gives "terminology"), or only itself when it
+        is short ("um" is not "argument"). A topic keyword with several words or
+        punctuation ("em dash", "Q&A") is counted in the text of the paragraphs
+        the index offers for it. Other keywords contribute their content words.
+        """
+        terms: set[str] = set()
+        phrases: dict[str, dict[int, int]] = {}
+        all_paras = self._load_all()
+        for keyword in _gather_keywords_for_section(section):
+            lowered = keyword.lower()
+            if lowered not in _TOPIC_TERMS:
+                terms.update(_content_words(keyword))
+            elif tokenize(lowered) == [lowered]:
+                terms.update(self._index.expand(lowered))
+            elif tokenize(lowered):
+                pattern = keyword_pattern(lowered)
+                counts = {}
+                for paragraph_id in self._index.keyword_candidates(lowered):
+                    found = len(pattern.findall(all_paras[paragraph_id][1]))
+                    if found:
+                        counts[paragraph_id] = found
+                phrases[lowered] = counts
+        return terms, phrases
+
+    def _select(
+        self, queries: list[dict[str, float]], phrases: dict[str, dict[int, int]], max_chars: int
+    ) -> list[list[int]]:
+        """Paragraph ids chosen for each query (one per subsection), within ``max_chars`` in total.
+
+        Subsections take turns picking their next-best match that still fits the
+        remaining budget, so an excerpt relevant to several goes to whichever ranks
+        it first and no subsection starves. A long top match is not ruled out by a
+        fixed share, and budget a sparse subsection leaves goes to the others.
+        Near-duplicates are skipped across all subsections.
+        """
+        all_paras = self._load_all()
+        scores = self._retriever.scores(queries, phrases)
+        count = scores.shape[1]
+        rankings = []
+        for column in range(count):
+            matches = np.flatnonzero(scores[:, column] > 0)
+            rankings.append(matches[np.argsort(-scores[matches, column], kind="stable")].tolist())
+        selected: list[list[int]] = [[] for _ in range(count)]
+        remaining = max_chars
+        cursors = [0] * count
+        taken: set[int] = set()
+        cleaned: dict[int, str] = {}
+        duplicates = NearDuplicateFilter()
+        active = list(range(count))
+        while active:
+            for subsection in list(active):
+                ranking = rankings[subsection]
+                while cursors[subsection] < len(ranking):
+                    paragraph_id = ranking[cursors[subsection]]
+                    cursors[subsection] += 1
+                    if paragraph_id in taken:
+                        continue
+                    if paragraph_id not in cleaned:
+                        cleaned[paragraph_id] = _clean_paragraph(all_paras[paragraph_id][1])
+                    text = cleaned[paragraph_id]
+                    if len(text) <= 30 or len(text) > remaining:
+                        continue
+                    if duplicates.is_duplicate(text):
+                        continue
+                    duplicates.add(text)
+                    taken.add(paragraph_id)
+                    selected[subsection].append(paragraph_id)
+                    remaining -= len(text)
+                    break
+                else:
+                    active.remove(subsection)
+        return selected
@@ -1,6 +1,25 @@
+"""Per-section pipeline status.
+
+Two interchangeable backends:
+
+- ``StatusTracker`` keeps everything in ``chapters/status.json`` (the default).
+- ``SqliteStatusTracker`` keeps it in ``chapters/status.db`` (SQLite, WAL mode).
+  Every update is one transaction, so parallel sections and separate processes
+  never lose each other's writes, and each completed step is also recorded in
+  a ``step_history`` table with its start time and duration.
+
+``open_status_tracker`` picks the backend from ``STATUS_BACKEND``, or from the
+store that already exists when it is not set.
+"""
+
 from __future__ import annotations
 
 import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
 
@@ -9,6 +28,8 @@ class StatusTracker:
     def __init__(self, base_dir: Path):
         self.status_path = base_dir / "chapters" / "status.json"
         self.status_path.parent.mkdir(parents=True, exist_ok=True)
+        # Sections can run on worker threads; serialize the read-modify-write cycles.
+        self._lock = threading.Lock()
 
     def _load(self) -> dict:
         if not self.status_path.exists():
@@ -16,61 +37,282 @@ class StatusTracker:
         return json.loads(self.status_path.read_text(encoding="utf-8"))
 
     def _save(self, data: dict) -> None:
-        self.status_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        # Write a temp file and swap it in, so a reader never sees a half-written file.
+        tmp_path = self.status_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp_path.replace(self.status_path)
 
     def get_status(self, section_number: int) -> dict:
-        data = self._load()
+        with self._lock:
+            data = self._load()
         return data.get(str(section_number), {})
 
+    def start_step(self, section_number: int, step_number: int) -> None:
+        """Mark the start of a step. The JSON file keeps no timings, so this is a no-op."""
+
     def update_step(self, section_number: int, step_number: int, section: dict) -> None:
-        data = self._load()
-        entry = data.get(str(section_number), {})
-        steps = set(entry.get("steps_completed", []))
-        steps.add(step_number)
-        entry.update(
-            {
-                "title": section.get("title"),
-                "build_order": section.get("build_order"),
-                "steps_completed": sorted(steps),
-                "status": entry.get("status", "In Progress"),
-                "last_updated": datetime.utcnow().isoformat(),
-            }
-        )
-        data[str(section_number)] = entry
-        self._save(data)
+        with self._lock:
+            data = self._load()
+            entry = data.get(str(section_number), {})
+            steps = set(entry.get("steps_completed", []))
+            steps.add(step_number)
+            entry.update(
+                {
+                    "title": section.get("title"),
+                    "build_order": section.get("build_order"),
+                    "steps_completed": sorted(steps),
+                    "status": entry.get("status", "In Progress"),
+                    "last_updated": datetime.utcnow().isoformat(),
+                }
+            )
+            data[str(section_number)] = entry
+            self._save(data)
 
     def set_approved(self, section_number: int, section: dict) -> None:
-        data = self._load()
-        entry = data.get(str(section_number), {})
-        entry.update(
-            {
-                "title": section.get("title"),
-                "build_order": section.get("build_order"),
-                "status": "Final",
-                "last_updated": datetime.utcnow().isoformat(),
-            }
+        with self._lock:
+            data = self._load()
+            entry = data.get(str(section_number), {})
+            entry.update(
+                {
+                    "title": section.get("title"),
+                    "build_order": section.get("build_order"),
+                    "status": "Final",
+                    "last_updated": datetime.utcnow().isoformat(),
+                }
+            )
+            data[str(section_number)] = entry
+            self._save(data)
+
+    def update_metrics(self, section_number: int, word_count: int, grade: float | None, score: float | None) -> None:
+        with self._lock:
+            data = self._load()
+            entry = data.get(str(section_number), {})
+            entry.update(
+                {
+                    "word_count": word_count,
+                    "readability_grade": grade,
+                    "review_score": score,
+                    "last_updated": datetime.utcnow().isoformat(),
+                }
+            )
+            data[str(section_number)] = entry
+            self._save(data)
+
+    def get_all_statuses(self) -> dict:
+        with self._lock:
+            return self._load()
+
+    def get_progress(self, total_sections: int) -> tuple[int, int]:
+        with self._lock:
+            data = self._load()
+        completed = sum(1 for entry in data.values() if entry.get("status") == "Final")
+        return completed, total_sections
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    number INTEGER PRIMARY KEY,
+    title TEXT,
+    build_order INTEGER,
+    status TEXT NOT NULL DEFAULT 'In Progress',
+    word_count INTEGER,
+    readability_grade REAL,
+    review_score REAL,
+    last_updated TEXT
+);
+CREATE TABLE IF NOT EXISTS steps (
+    section INTEGER NOT NULL,
+    step INTEGER NOT NULL,
+    started_at TEXT,
+    started_clock REAL,
+    completed_at TEXT,
+    duration_seconds REAL,
+    PRIMARY KEY (section, step)
+);
+CREATE TABLE IF NOT EXISTS step_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    section INTEGER NOT NULL,
+    step INTEGER NOT NULL,
+    started_at TEXT,
+    completed_at TEXT NOT NULL,
+    duration_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS step_history_section ON step_history (section, step);
+"""
+
+
+class SqliteStatusTracker:
+    """StatusTracker backed by ``chapters/status.db``.
+
+    ``steps`` holds the latest run of each step; ``step_history`` keeps every
+    completion. Durations are measured from ``start_step`` to ``update_step``.
+    An existing ``status.json`` is imported on first use and renamed to
+    ``status.json.migrated``.
+    """
+
+    def __init__(self, base_dir: Path):
+        self.db_path = base_dir / "chapters" / "status.db"
+        self.json_path = base_dir / "chapters" / "status.json"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self._migrate_json()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; writes open their own BEGIN IMMEDIATE transaction.
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _transaction(self, work) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                work(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _migrate_json(self) -> None:
+        if not self.json_path.exists():
+            return
+        data = json.loads(self.json_path.read_text(encoding="utf-8") or "{}")
+
+        def _import(conn: sqlite3.Connection) -> None:
+            if conn.execute("SELECT 1 FROM sections LIMIT 1").fetchone():
+                return  # already populated, e.g. by a concurrent first run
+            for number, entry in data.items():
+                conn.execute(
+                    "INSERT INTO sections (number, title, build_order, status, word_count, readability_grade, "
+                    "review_score, last_updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        int(number),
+                        entry.get("title"),
+                        entry.get("build_order"),
+                        entry.get("status", "In Progress"),
+                        entry.get("word_count"),
+                        entry.get("readability_grade"),
+                        entry.get("review_score"),
+                        entry.get("last_updated"),
+                    ),
+                )
+                for step in entry.get("steps_completed", []):
+                    conn.execute(
+                        "INSERT INTO steps (section, step, completed_at) VALUES (?, ?, ?)",
+                        (int(number), step, entry.get("last_updated")),
+                    )
+
+        self._transaction(_import)
+        try:
+            self.json_path.replace(self.json_path.with_name("status.json.migrated"))
+        except FileNotFoundError:
+            pass  # another process migrated it at the same time
+
+    @staticmethod
+    def _upsert_section(conn: sqlite3.Connection, section_number: int, section: dict, now: str) -> None:
+        conn.execute(
+            "INSERT INTO sections (number, title, build_order, last_updated) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (number) DO UPDATE SET title = excluded.title, build_order = excluded.build_order, "
+            "last_updated = excluded.last_updated",
+            (section_number, section.get("title"), section.get("build_order"), now),
         )
-        data[str(section_number)] = entry
-        self._save(data)
+
+    def get_status(self, section_number: int) -> dict:
+        return self.get_all_statuses().get(str(section_number), {})
+
+    def start_step(self, section_number: int, step_number: int) -> None:
+        now = datetime.utcnow().isoformat()
+        self._transaction(
+            lambda conn: conn.execute(
+                "INSERT INTO steps (section, step, started_at, started_clock) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (section, step) DO UPDATE SET started_at = excluded.started_at, "
+                "started_clock = excluded.started_clock",
+                (section_number, step_number, now, time.time()),
+            )
+        )
+
+    def update_step(self, section_number: int, step_number: int, section: dict) -> None:
+        now = datetime.utcnow().isoformat()
+
+        def _complete(conn: sqlite3.Connection) -> None:
+            self._upsert_section(conn, section_number, section, now)
+            row = conn.execute(
+                "SELECT started_at, started_clock FROM steps WHERE section = ? AND step = ?",
+                (section_number, step_number),
+            ).fetchone()
+            started_at = row["started_at"] if row else None
+            duration = time.time() - row["started_clock"] if row and row["started_clock"] is not None else None
+            conn.execute(
+                "INSERT INTO steps (section, step, completed_at, duration_seconds) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (section, step) DO UPDATE SET completed_at = excluded.completed_at, "
+                "duration_seconds = excluded.duration_seconds, started_clock = NULL",
+                (section_number, step_number, now, duration),
+            )
+            conn.execute(
+                "INSERT INTO step_history (section, step, started_at, completed_at, duration_seconds) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (section_number, step_number, started_at, now, duration),
+            )
+
+        self._transaction(_complete)
+
+    def set_approved(self, section_number: int, section: dict) -> None:
+        now = datetime.utcnow().isoformat()
+
+        def _approve(conn: sqlite3.Connection) -> None:
+            self._upsert_section(conn, section_number, section, now)
+            conn.execute("UPDATE sections SET status = 'Final' WHERE number = ?", (section_number,))
+
+        self._transaction(_approve)
 
     def update_metrics(self, section_number: int, word_count: int, grade: float | None, score: float | None) -> None:
-        data = self._load()
-        entry = data.get(str(section_number), {})
-        entry.update(
-            {
-                "word_count": word_count,
-                "readability_grade": grade,
-                "review_score": score,
-                "last_updated": datetime.utcnow().isoformat(),
-            }
+        now = datetime.utcnow().isoformat()
+        self._transaction(
+            lambda conn: conn.execute(
+                "INSERT INTO sections (number, word_count, readability_grade, review_score, last_updated) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (number) DO UPDATE SET word_count = excluded.word_count, "
+                "readability_grade = excluded.readability_grade, review_score = excluded.review_score, "
+                "last_updated = excluded.last_updated",
+                (section_number, word_count, grade, score, now),
+            )
         )
-        data[str(section_number)] = entry
-        self._save(data)
 
     def get_all_statuses(self) -> dict:
-        return self._load()
+        """Same shape as ``status.json``: section number (str) -> entry."""
+        with closing(self._connect()) as conn:
+            sections = conn.execute("SELECT * FROM sections").fetchall()
+            steps = conn.execute(
+                "SELECT section, step FROM steps WHERE completed_at IS NOT NULL ORDER BY section, step"
+            ).fetchall()
+        completed: dict[int, list[int]] = {}
+        for row in steps:
+            completed.setdefault(row["section"], []).append(row["step"])
+        data = {}
+        for row in sections:
+            entry = {key: row[key] for key in row.keys() if key != "number" and row[key] is not None}
+            entry["steps_completed"] = completed.get(row["number"], [])
+            data[str(row["number"])] = entry
+        return data
 
     def get_progress(self, total_sections: int) -> tuple[int, int]:
-        data = self._load()
-        completed = sum(1 for entry in data.values() if entry.get("status") == "Final")
+        with closing(self._connect()) as conn:
+            completed = conn.execute("SELECT COUNT(*) FROM sections WHERE status = 'Final'").fetchone()[0]
         return completed, total_sections
+
+
+def open_status_tracker(base_dir: Path, backend: str | None = None):
+    """Return the status tracker for ``backend`` ("json" or "sqlite").
+
+    A configured backend is always respected. Only when none is configured does
+    an existing ``status.db`` win; otherwise the JSON file is used.
+    """
+    if not backend:
+        backend = "sqlite" if (base_dir / "chapters" / "status.db").exists() else "json"
+    backend = backend.lower().strip()
+    if backend == "sqlite":
+        return SqliteStatusTracker(base_dir)
+    if backend == "json":
+        return StatusTracker(base_dir)
+    raise ValueError(f"Unknown STATUS_BACKEND: {backend} (expected json or sqlite)")
@@ -0,0 +1,104 @@
+"""Vector retrieval of source paragraphs for the subsections of a section.
+
+Every paragraph in the source index is a sparse vector over word stems. Each
+entry is the stem's BM25 weight in that paragraph, so a query vector's dot
+product with it is the paragraph's BM25 score. The vectors are built once from
+the index postings and no paragraph text is read again. Each subsection becomes
+one weighted query over the same stems. A single matrix product then scores
+every paragraph against every subsection. Keywords that are not one word, such
+as "em dash" or "Q&A", cannot be looked up by stem; the caller counts them in
+the text and they are scored as extra columns with the same BM25 weighting.
+
+Stemming only strips common English suffixes. That is enough for
+"objections", "objecting" and "objection" to meet on "object", which catches
+the inflected rewordings that exact keyword matching misses. Everything runs
+locally; no embedding service is involved.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from pipeline.source_index import SourceIndex
+
+# Longest first, so "ations" is tried before "s".
+_SUFFIXES = ("ations", "ation", "ings", "ing", "ions", "ion", "ies", "ied", "ers", "er", "es", "ed", "ly", "s", "y", "e")
+# Shortest stem left after stripping a suffix.
+MIN_STEM = 4
+
+
+def stem(token: str) -> str:
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            if suffix == "s" and token.endswith("ss"):
+                continue  # "witness", not "witnes"
+            return token[: -len(suffix)]
+    return token
+
+
+class VectorRetriever:
+    def __init__(self, index: SourceIndex, paragraphs: int, k1: float, b: float):
+        self.paragraphs = paragraphs
+        self._stems: dict[str, int] = {}
+        rows, columns, counts = [], [], []
+        for token, items in index.postings.items():
+            column = self._stems.setdefault(stem(token), len(self._stems))
+            for paragraph_id, tf in items:
+                rows.append(paragraph_id)
+                columns.append(column)
+                counts.append(tf)
+        width = max(len(self._stems), 1)
+        # Tokens that share a stem within one paragraph add up. np.unique also sorts
+        # the entries by column, so each stem's entries sit in one contiguous slice.
+        keys, inverse = np.unique(
+            np.array(columns, dtype=np.int64) * paragraphs + np.array(rows, dtype=np.int64), return_inverse=True
+        )
+        tf = np.bincount(inverse, weights=np.array(counts, dtype=np.float64), minlength=len(keys))
+        self._columns, self._rows = np.divmod(keys, max(paragraphs, 1))
+        document_frequency = np.bincount(self._columns, minlength=width)
+        lengths = np.array([index.length(paragraph_id) for paragraph_id in range(paragraphs)], dtype=np.float64)
+        self.k1 = k1
+        self._norm = 1 - b + b * lengths / (index.average_length or 1.0)
+        self._weights = self._bm25(self._rows, tf, document_frequency[self._columns])
+        self._starts = np.searchsorted(self._columns, np.arange(width + 1))
+
+    def _bm25(self, rows: np.ndarray, tf: np.ndarray, document_frequency) -> np.ndarray:
+        idf = np.log(1 + (self.paragraphs - document_frequency + 0.5) / (document_frequency + 0.5))
+        return idf * tf * (self.k1 + 1) / (tf + self.k1 * self._norm[rows])
+
+    def scores(
+        self, queries: list[dict[str, float]], phrases: dict[str, dict[int, int]] | None = None
+    ) -> np.ndarray:
+        """BM25 score of every paragraph (rows) for every query (columns).
+
+        Each query maps terms to weights. A term listed in ``phrases`` is scored
+        from the paragraph counts given there instead of by stem. Only the stems
+        and phrases the queries use are materialized, so the paragraph matrix
+        stays a few dozen columns wide.
+        """
+        phrases = phrases or {}
+        terms = {term for query in queries for term in query}
+        columns = sorted({self._stems[stem(term)] for term in terms - phrases.keys() if stem(term) in self._stems})
+        position = {column: i for i, column in enumerate(columns)}
+        phrase_position = {term: len(columns) + i for i, term in enumerate(sorted(terms & phrases.keys()))}
+        query_matrix = np.zeros((len(queries), len(columns) + len(phrase_position)))
+        for row, query in enumerate(queries):
+            for term, weight in query.items():
+                if term in phrase_position:
+                    i = phrase_position[term]
+                elif stem(term) in self._stems:
+                    i = position[self._stems[stem(term)]]
+                else:
+                    continue
+                query_matrix[row, i] = max(query_matrix[row, i], weight)
+        documents = np.zeros((self.paragraphs, query_matrix.shape[1]))
+        for i, column in enumerate(columns):
+            start, end = self._starts[column], self._starts[column + 1]
+            documents[self._rows[start:end], i] = self._weights[start:end]
+        for term, i in phrase_position.items():
+            counts = phrases[term]
+            if counts:
+                rows = np.fromiter(counts, dtype=np.int64, count=len(counts))
+                tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+                documents[rows, i] = self._bm25(rows, tf, len(counts))
+        return documents @ query_matrix.T
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The CLI runs from the bookforge folder and imports its packages top-level.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
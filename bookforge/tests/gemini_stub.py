@@ -0,0 +1,118 @@
+"""Minimal stand-in for the Gemini batch API, for tests and for trying ``bookforge batch`` offline.
+
+It answers the two calls the batcher makes: ``models/<model>:batchGenerateContent``
+creates a job, and ``batches/<id>`` reports it. A job runs until it has been polled
+``polls_to_finish`` times, then succeeds with one response per request, in reverse
+order, so callers must match results by their ``key`` metadata. Requests whose
+key is in ``fail_keys`` come back with an error instead.
+
+Run it directly and set ``GOOGLE_GEMINI_BASE_URL=http://127.0.0.1:8765`` in ``.env``::
+
+    python tests/gemini_stub.py 8765
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class GeminiBatchStub(ThreadingHTTPServer):
+    def __init__(self, port: int = 0, polls_to_finish: int = 2, fail_keys: set[str] | None = None):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.polls_to_finish = polls_to_finish
+        self.fail_keys = fail_keys or set()
+        self.jobs: dict[str, dict] = {}
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self) -> GeminiBatchStub:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def create(self, model: str, batch: dict) -> dict:
+        name = f"batches/job{len(self.jobs) + 1}"
+        self.jobs[name] = {
+            "model": model,
+            "displayName": batch.get("displayName", ""),
+            "requests": batch["inputConfig"]["requests"]["requests"],
+            "polls": 0,
+        }
+        return {"name": name, "metadata": {"state": "BATCH_STATE_PENDING", "displayName": batch.get("displayName", "")}}
+
+    def get(self, name: str) -> dict | None:
+        job = self.jobs.get(name)
+        if job is None:
+            return None
+        job["polls"] += 1
+        metadata = {"model": job["model"], "displayName": job["displayName"], "state": "BATCH_STATE_RUNNING"}
+        if job["polls"] >= self.polls_to_finish:
+            metadata["state"] = "BATCH_STATE_SUCCEEDED"
+            responses = [self._response(request) for request in reversed(job["requests"])]
+            metadata["output"] = {"inlinedResponses": {"inlinedResponses": responses}}
+        return {"name": name, "metadata": metadata, "done": metadata["state"] == "BATCH_STATE_SUCCEEDED"}
+
+    def _response(self, request: dict) -> dict:
+        metadata = request.get("metadata", {})
+        key = metadata.get("key", "")
+        if key in self.fail_keys:
+            return {"metadata": metadata, "error": {"code": 400, "message": f"stub rejected {key}"}}
+        return {
+            "metadata": metadata,
+            "response": {
+                "candidates": [
+                    {"content": {"role": "model", "parts": [{"text": f"Stub result for {key}."}]}, "finishReason": "STOP"}
+                ],
+                "usageMetadata": {"promptTokenCount": 700, "candidatesTokenCount": 300, "totalTokenCount": 1000},
+            },
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: GeminiBatchStub
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, payload: dict, status: int = 200) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        name = "batches/" + path.rsplit("/batches/", 1)[-1] if "/batches/" in path else ""
+        job = self.server.get(name) if name else None
+        if job is None:
+            self._send({"error": {"code": 404, "message": f"no such batch: {path}", "status": "NOT_FOUND"}}, 404)
+        else:
+            self._send(job)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.split("?", 1)[0]
+        if path.endswith(":batchGenerateContent") and "/models/" in path:
+            model = path.rsplit("/models/", 1)[1].split(":", 1)[0]
+            self._send(self.server.create(model, body["batch"]))
+        else:
+            self._send({"error": {"code": 404, "message": f"unsupported: {path}", "status": "NOT_FOUND"}}, 404)
+
+
+if __name__ == "__main__":
+    with GeminiBatchStub(int(sys.argv[1]) if len(sys.argv) > 1 else 8765) as stub:
+        print(f"Gemini batch stub listening on {stub.url}")
+        stub._thread.join()
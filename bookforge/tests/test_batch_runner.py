@@ -0,0 +1,88 @@
+"""``bookforge batch`` submit, poll and collect against the local Gemini batch stub."""
+
+import json
+
+import pytest
+
+from config import Config
+from gemini_stub import GeminiBatchStub
+from pipeline.batch_runner import BatchRunner
+from pipeline.build_manifest import BuildManifest
+from pipeline.orchestrator import Pipeline
+
+SECTIONS = [
+    {
+        "number": number,
+        "title": f"Section {number}",
+        "subtitle": "Subtitle",
+        "part": "PART ONE",
+        "slug": f"section-{number}",
+        "subsections": [f"{number}.1 First", f"{number}.2 Second"],
+        "word_target": 2000,
+        "build_order": number,
+    }
+    for number in (1, 2)
+]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with GeminiBatchStub() as server:
+        # google-genai sends every Gemini API call to this base URL.
+        monkeypatch.setenv("GOOGLE_GEMINI_BASE_URL", server.url)
+        monkeypatch.delenv("GOOGLE_GENAI_USE_VERTEXAI", raising=False)
+        yield server
+
+
+@pytest.fixture
+def runner(tmp_path, stub):
+    (tmp_path / "config").mkdir()
+    toc = {"research_strategy": {"deep_research_sections": []}, "sections": SECTIONS}
+    (tmp_path / "config" / "toc.json").write_text(json.dumps(toc), encoding="utf-8")
+    config = Config("anthropic-key", "openai-key", "google-key", cache_enabled=False, api_timeout=30.0)
+    pipeline = Pipeline(config, tmp_path, tmp_path / "logs" / "api_calls.log", live_status=False)
+    return BatchRunner(pipeline, tmp_path / "logs" / "batch-jobs")
+
+
+def _research_path(runner, number):
+    section = runner.pipeline.get_section(number)
+    return runner.pipeline.get_chapter_dir(section) / "research" / "research.md"
+
+
+def test_submit_poll_and_collect(runner, stub):
+    job = runner.submit("research")
+    assert [request["section"] for request in job["requests"]] == [1, 2]
+    assert stub.jobs[job["name"]]["model"] == runner.pipeline.config.gemini_model
+    # Sections in a pending job are not submitted twice.
+    assert runner.collect("research") == []
+
+    assert not runner.poll(job)
+    # A later ``bookforge batch collect`` resumes from the saved job record alone.
+    resumed = runner.load(job["name"])
+    assert resumed["state"] == "JOB_STATE_RUNNING"
+    assert runner.poll(resumed)
+    assert runner.load(job["name"])["state"] == "JOB_STATE_SUCCEEDED"
+    assert runner.pending_jobs() == []
+
+    for number in (1, 2):
+        path = _research_path(runner, number)
+        assert f"Stub result for research-{number}." in path.read_text(encoding="utf-8")
+        assert BuildManifest(path.parents[1]).recorded(path)["parts"]
+
+    ledger = [json.loads(line) for line in (runner.pipeline.project_root / "logs" / "costs.jsonl").open()]
+    assert [(entry["section"], entry["batch"]) for entry in ledger] == [(1, True), (2, True)]
+    # Both outputs are now up to date.
+    assert runner.collect("research") == []
+
+
+def test_failed_request_is_reported_and_resubmitted(runner, stub):
+    stub.fail_keys = {"research-2"}
+    job = runner.submit("research")
+    while not runner.poll(job):
+        pass
+
+    failed = [request for request in runner.load(job["name"])["requests"] if "error" in request]
+    assert [request["section"] for request in failed] == [2]
+    assert _research_path(runner, 1).exists()
+    assert not _research_path(runner, 2).exists()
+    assert [request["section"] for request in runner.collect("research")] == [2]
@@ -0,0 +1,66 @@
+"""Streaming .docx text extraction, checked against python-docx."""
+
+import zipfile
+from pathlib import Path
+
+import docx
+import pytest
+
+from pipeline.docx_reader import iter_docx
+
+SOURCE_FILES = sorted((Path(__file__).resolve().parents[1] / "source-files").glob("*.docx"))
+
+_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+
+
+def _text_box(text: str) -> str:
+    """A run holding a text box the way Word saves one: a DrawingML choice with a VML fallback."""
+    content = f"<w:txbxContent><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:txbxContent>"
+    return (
+        "<w:r><mc:AlternateContent>"
+        f'<mc:Choice Requires="wps"><w:drawing><wps:txbx>{content}</wps:txbx></w:drawing></mc:Choice>'
+        f"<mc:Fallback><w:pict><v:textbox>{content}</v:textbox></w:pict></mc:Fallback>"
+        "</mc:AlternateContent></w:r>"
+    )
+
+
+def _write_docx(path: Path, body: str) -> Path:
+    docx.Document().save(path)
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    parts["word/document.xml"] = (
+        f'<?xml version="1.0"?><w:document {_NAMESPACES}><w:body>{body}<w:sectPr/></w:body></w:document>'
+    ).encode("utf-8")
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+    return path
+
+
+@pytest.mark.parametrize("path", SOURCE_FILES, ids=lambda path: path.name)
+def test_body_paragraphs_match_python_docx(path):
+    ours = [text for text, location in iter_docx(path) if location.startswith("paragraph ")]
+    expected = [paragraph.text.strip() for paragraph in docx.Document(str(path)).paragraphs]
+    assert ours == [text for text in expected if text]
+
+
+def test_text_box_keeps_the_surrounding_paragraph(tmp_path):
+    body = (
+        f"<w:p><w:r><w:t>Before the box, </w:t></w:r>{_text_box('Boxed note')}<w:r><w:t>after it.</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>Next paragraph.</w:t></w:r></w:p>"
+    )
+    path = _write_docx(tmp_path / "text-box.docx", body)
+    assert list(iter_docx(path)) == [
+        ("Boxed note", "text box 1"),
+        ("Before the box, after it.", "paragraph 1"),
+        ("Next paragraph.", "paragraph 2"),
+    ]
+    assert [paragraph.text for paragraph in docx.Document(str(path)).paragraphs] == [
+        "Before the box, after it.",
+        "Next paragraph.",
+    ]
@@ -0,0 +1,42 @@
+"""Token reservations in the shared rate limiter."""
+
+import asyncio
+import pytest
+
+from agents.base_agent import BaseAgent
+from agents.rate_limiter import get_rate_limiter
+from config import Config
+
+
+class _BadRequest(Exception):
+    status_code = 400
+
+
+def test_failed_call_gives_its_reservation_back(tmp_path):
+    config = Config(anthropic_api_key="", openai_api_key="", google_api_key="", anthropic_tpm=100_000)
+    agent = BaseAgent(config, None, None, tmp_path / "api.log", clients=object())
+
+    async def call():
+        raise _BadRequest("prompt too long")
+
+    with pytest.raises(_BadRequest):
+        asyncio.run(
+            agent._complete(
+                "failing-model", "draft", 1, call, agent._parse_anthropic,
+                provider="anthropic", prompt="word " * 400, max_tokens=8000,
+            )
+        )
+
+    limiter = get_rate_limiter("anthropic", "failing-model")
+    limiter.tokens._refill(limiter.tokens.updated)
+    assert limiter.tokens.level == limiter.tokens.capacity
+    assert "success=False" in (tmp_path / "api.log").read_text()
+
+
+def test_settle_corrects_the_estimate_to_actual_usage():
+    limiter = get_rate_limiter("anthropic", "settling-model", tpm=60_000)
+    reserved = asyncio.run(limiter.acquire(10_000))
+
+    limiter.settle(reserved, 2_500)
+
+    assert limiter.tokens.capacity - 2_500 <= limiter.tokens.level <= limiter.tokens.capacity - 2_400
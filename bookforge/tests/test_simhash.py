@@ -0,0 +1,43 @@
+"""Near-duplicate detection for source excerpts."""
+
+from pipeline.simhash import NearDuplicateFilter, simhash, words
+
+LONG = (
+    "The reporter marks every inaudible passage with a bracketed time stamp so the attorneys can "
+    "check the recording later, and notes the speaker when the voice is recognizable but the words "
+    "are not. A guess is never written as if it were heard, because the transcript is certified as "
+    "a verbatim record of the proceeding and any doubt must be visible on the page."
+)
+
+
+def _filter_with(text: str) -> NearDuplicateFilter:
+    duplicates = NearDuplicateFilter()
+    duplicates.add(text)
+    return duplicates
+
+
+def test_leading_list_markers_are_ignored():
+    assert words("B. Structural Philosophy: Building Transcripts") == ["structural", "philosophy", "building", "transcripts"]
+    assert words("1.2 Gavel etiquette") == words("(a) Gavel etiquette") == words("• Gavel etiquette")
+    assert simhash("B. Structural Philosophy: Building Transcripts Through Punctuation") == simhash(
+        "Structural Philosophy: Building Transcripts Through Punctuation"
+    )
+
+
+def test_short_paragraphs_differing_only_in_their_first_words_are_duplicates():
+    duplicates = _filter_with("Moreover, the reporter marks every inaudible passage with a bracketed time stamp.")
+
+    assert duplicates.is_duplicate("In practice the reporter marks every inaudible passage with a bracketed time stamp.")
+    assert duplicates.is_duplicate("B. Moreover, the reporter marks every inaudible passage with a bracketed time stamp.")
+    assert not duplicates.is_duplicate("Speaker labels are written in capitals and followed by a colon.")
+
+
+def test_long_paragraphs_differing_only_in_their_first_words_are_duplicates():
+    duplicates = _filter_with(LONG)
+
+    assert duplicates.is_duplicate("In every deposition, " + LONG[0].lower() + LONG[1:])
+    assert not duplicates.is_duplicate(
+        "Speaker labels are written in capitals and followed by a colon, and a new label starts each change "
+        "of speaker. Colloquy between counsel is set apart from question and answer so a reader can tell "
+        "testimony from argument at a glance, which matters when excerpts are read into the record."
+    )
@@ -0,0 +1,63 @@
+"""Keyword lookups through the source index, checked against a brute-force scan of the bundled source files."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pipeline.source_index import keyword_pattern
+from pipeline.source_loader import _TOPIC_TERMS, SourceLoader
+
+SOURCE_DIR = Path(__file__).resolve().parents[1] / "source-files"
+KEYWORDS = sorted(_TOPIC_TERMS | {"em dash", "q&a", "multi-speaker", "voice writ", "um", "ai", "rate", "terminol"})
+
+
+@pytest.fixture(scope="module")
+def loader(tmp_path_factory):
+    # A copy, so the index and paragraph cache are built outside the repository.
+    root = tmp_path_factory.mktemp("project")
+    shutil.copytree(SOURCE_DIR, root / "source-files", ignore=shutil.ignore_patterns(".index.json"))
+    loader = SourceLoader(root, workers=1)
+    loader._load_all()
+    return loader
+
+
+def _scan(loader, keyword: str) -> dict[int, int]:
+    """Occurrences of ``keyword`` per paragraph, found by reading every paragraph."""
+    pattern = keyword_pattern(keyword)
+    counts = {}
+    for paragraph_id, (_, text) in enumerate(loader._all_paragraphs):
+        found = len(pattern.findall(text))
+        if found:
+            counts[paragraph_id] = found
+    return counts
+
+
+@pytest.mark.parametrize("keyword", KEYWORDS)
+def test_candidates_include_every_paragraph_with_the_keyword(loader, keyword):
+    assert set(_scan(loader, keyword)) <= loader._index.keyword_candidates(keyword)
+
+
+@pytest.mark.parametrize("keyword", [keyword for keyword in KEYWORDS if keyword.isalnum()])
+def test_expansion_matches_a_vocabulary_scan(loader, keyword):
+    pattern = keyword_pattern(keyword)
+    assert loader._index.expand(keyword) == {token for token in loader._index.postings if pattern.match(token)}
+
+
+def test_short_keywords_match_whole_words_and_long_ones_prefixes():
+    assert keyword_pattern("um").search("Um, I think so")
+    assert not keyword_pattern("um").search("a strong argument")
+    assert not keyword_pattern("rate").search("an accurate record")
+    assert keyword_pattern("rate").search("page rates")
+    assert keyword_pattern("terminol").search("legal terminology")
+    assert keyword_pattern("q&a").search("Q&A format")
+    assert not keyword_pattern("q&a").search("Q&As")
+
+
+def test_phrase_counts_match_a_text_scan(loader):
+    section = {"number": 1, "title": "Dashes and Speaker Labels", "subtitle": "", "subsections": ["1.1 Dashes"]}
+    _, phrases = loader._queries(section)
+    for phrase in ("em dash", "q&a"):
+        expected = _scan(loader, phrase)
+        assert expected
+        assert phrases[phrase] == expected
@@ -0,0 +1,52 @@
+"""Excerpt selection in ``SourceLoader`` against a small generated source folder."""
+
+import pytest
+
+from pipeline.source_loader import SourceLoader
+
+SECTION = {
+    "number": 1,
+    "title": "Courtroom Basics",
+    "subtitle": "",
+    "subsections": ["1.1 Gavel Etiquette", "1.2 Docket Numbering", "1.3 Bailiff Duties"],
+}
+
+
+def _filler(topic: str, count: int) -> str:
+    return " ".join(f"{topic} note{index} covers detail{index * 7} for clause{index * 13}." for index in range(count))
+
+
+@pytest.fixture
+def loader(tmp_path):
+    lines = [
+        # The only match for 1.1, longer than an equal share of the budget.
+        f"Gavel etiquette: {_filler('gavel', 60)}",
+        f"Docket numbering follows the clerk's register for each docket entry {_filler('docket', 3)}",
+        f"Bailiff duties include escorting the jury and keeping order, {_filler('bailiff', 3)}",
+    ]
+    (tmp_path / "source-files").mkdir()
+    (tmp_path / "source-files" / "notes.txt").write_text("\n".join(lines) + "\n")
+    return SourceLoader(tmp_path, workers=1)
+
+
+def test_long_top_match_is_selected_when_the_total_budget_allows(loader):
+    queries, phrases = loader._queries(SECTION)
+    long_text = loader._load_all()[0][1]
+    max_chars = 6000
+    assert max_chars // len(SECTION["subsections"]) < len(long_text) < max_chars
+
+    selected = loader._select(queries, phrases, max_chars)
+
+    assert selected == [[0], [1], [2]]
+
+
+def test_selection_stays_within_the_total_budget(loader):
+    queries, phrases = loader._queries(SECTION)
+    paragraphs = loader._load_all()
+    max_chars = len(paragraphs[0][1]) - 1
+
+    selected = loader._select(queries, phrases, max_chars)
+
+    chosen = [paragraph_id for ids in selected for paragraph_id in ids]
+    assert sorted(chosen) == [1, 2]
+    assert sum(len(paragraphs[paragraph_id][1]) for paragraph_id in chosen) <= max_chars
@@ -0,0 +1,48 @@
+"""Subsection-by-subsection revision in ``Writer``, against a fake Anthropic client."""
+
+import asyncio
+from types import SimpleNamespace
+
+from agents.writer import Writer
+from config import Config
+
+
+class _Messages:
+    def __init__(self):
+        self.prompts = []
+
+    async def create(self, **request):
+        text = request["messages"][0]["content"][-1]["text"]
+        self.prompts.append(text)
+        subsection = text.split("SUBSECTION:\n", 1)[1].split("\n\nOUTPUT:", 1)[0]
+        revised = subsection.replace("draft", "revised")
+        return SimpleNamespace(content=[SimpleNamespace(text=revised)], usage=SimpleNamespace(input_tokens=10, output_tokens=20))
+
+
+def _revise(tmp_path, draft: str) -> tuple[str, list[str]]:
+    messages = _Messages()
+    clients = SimpleNamespace(async_anthropic=lambda: SimpleNamespace(messages=messages))
+    exporter = SimpleNamespace(save_prompt=lambda *args: None)
+    cost_tracker = SimpleNamespace(log_api_call=lambda *args, **kwargs: 0.0)
+    config = Config(anthropic_api_key="", openai_api_key="", google_api_key="")
+    writer = Writer(config, exporter, cost_tracker, tmp_path / "api.log", clients=clients)
+    revised = asyncio.run(writer._revise_with_batches({"number": 1}, draft, "", "", "", "", tmp_path))
+    return revised, messages.prompts
+
+
+def test_subsections_are_reassembled_in_order_under_the_header(tmp_path):
+    draft = "## 1. Commas\n\nIntro draft.\n\n### 1.1 Lists\n\nFirst draft.\n\n### 1.2 Clauses\n\nSecond draft."
+
+    revised, prompts = _revise(tmp_path, draft)
+
+    assert len(prompts) == 2
+    assert revised == "## 1. Commas\n\nIntro draft.\n\n### 1.1 Lists\n\nFirst revised.\n\n### 1.2 Clauses\n\nSecond revised."
+
+
+def test_draft_without_subsections_is_revised_once_and_not_repeated(tmp_path):
+    draft = "## 1. Commas\n\nA short draft with no subsection headings."
+
+    revised, prompts = _revise(tmp_path, draft)
+
+    assert len(prompts) == 1
+    assert revised == "## 1. Commas\n\nA short revised with no subsection headings."